@@ -7,70 +7,97 @@ from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import CONF_DEVICE_ID, CONF_DEVICE_IP, CONF_LOCAL_KEY, DOMAIN
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_COMMAND_QUEUE_TTL,
+    CONF_DEVICE_ID,
+    CONF_DEVICE_IP,
+    CONF_LOCAL_KEY,
+    CONF_MODEL,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    DATA_BEACON_LISTENER,
+    DEFAULT_COMMAND_QUEUE_TTL,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_PROXY_PORT,
+    DOMAIN,
+)
 from .coordinator import EufyCleanDataUpdateCoordinator
+from .device_profile import get_device_profile
+from .discovery import BeaconListener
 from .eufy_api import EufyCleanAPI
+from .executor import (
+    async_cancel_close_on_stop,
+    async_close_on_stop,
+    async_get_io_executor,
+    async_shutdown_io_executor,
+)
+from .local_proxy import LocalProxy
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.VACUUM]
+PLATFORMS: list[Platform] = [Platform.SELECT, Platform.VACUUM]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Eufy Clean from a config entry."""
     _LOGGER.debug("Setting up Eufy Clean integration")
 
+    profile = get_device_profile(entry.data.get(CONF_MODEL))
+
     # Initialize API client
     api = EufyCleanAPI(
         device_id=entry.data[CONF_DEVICE_ID],
         local_key=entry.data[CONF_LOCAL_KEY],
         device_ip=entry.data[CONF_DEVICE_IP],
+        profile=profile,
+        executor=async_get_io_executor(hass),
+        command_queue_ttl=entry.options.get(
+            CONF_COMMAND_QUEUE_TTL, DEFAULT_COMMAND_QUEUE_TTL
+        ),
     )
 
-    # Test connection
-    try:
-        _LOGGER.info(
-            "Testing connection to device at %s (ID: %s)",
-            entry.data[CONF_DEVICE_IP],
-            entry.data[CONF_DEVICE_ID],
-        )
-        await api.async_connect()
-        status = await api.async_get_status()
-        if status is None:
-            error_msg = (
-                f"Unable to connect to device at {entry.data[CONF_DEVICE_IP]}. "
-                "Please check: 1) Device is powered on, "
-                "2) Device is connected to WiFi, "
-                f"3) IP address {entry.data[CONF_DEVICE_IP]} is correct, "
-                "4) Device and Home Assistant are on the same network"
-            )
-            _LOGGER.error(error_msg)
-            raise ConfigEntryNotReady(error_msg)
-        _LOGGER.info("Successfully connected to device")
-    except Exception as err:
-        _LOGGER.error(
-            "Error connecting to Eufy Clean device at %s: %s",
-            entry.data.get(CONF_DEVICE_IP, "unknown"),
-            err,
-        )
-        raise ConfigEntryNotReady from err
-
     # Create coordinator
     coordinator = EufyCleanDataUpdateCoordinator(hass, api)
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    # Publish the last known state until the device answers
+    await coordinator.async_restore_status()
 
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    # Poll right away when an unreachable device broadcasts again
+    if (listener := await async_get_beacon_listener(hass)) is not None:
+        entry.async_on_unload(
+            listener.register(api.device_id, coordinator.async_device_seen)
+        )
+
+    # Share the device session with other local clients
+    if port := entry.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT):
+        proxy = LocalProxy(
+            api, port, entry.options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST)
+        )
+        try:
+            await proxy.async_start(async_get_io_executor(hass))
+        except OSError as err:
+            _LOGGER.error("Cannot start local proxy on port %s: %s", port, err)
+        else:
+            entry.async_on_unload(proxy.close)
+
     # Setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Connect and fetch the first status in the background, so HA startup
+    # does not wait for robots that are asleep or off the network
+    entry.async_create_background_task(
+        hass,
+        coordinator.async_connect_and_refresh(),
+        f"{DOMAIN}_connect_{entry.entry_id}",
+    )
+
     # Setup update listener
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
@@ -88,11 +115,44 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Disconnect and cleanup
         coordinator: EufyCleanDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
         await coordinator.api.async_disconnect()
+        await coordinator.async_flush_history()
         hass.data[DOMAIN].pop(entry.entry_id)
 
+        if not hass.data[DOMAIN]:
+            async_close_beacon_listener(hass)
+            async_shutdown_io_executor(hass)
+
     return unload_ok
 
 
+async def async_get_beacon_listener(hass: HomeAssistant) -> BeaconListener | None:
+    """Return the beacon listener shared by all config entries.
+
+    Return None if the discovery port cannot be bound.
+    """
+    if (listener := hass.data.get(DATA_BEACON_LISTENER)) is not None:
+        return listener
+
+    listener = hass.data[DATA_BEACON_LISTENER] = BeaconListener()
+    try:
+        await listener.async_start(async_get_io_executor(hass))
+    except OSError as err:
+        _LOGGER.debug("Not listening for discovery beacons: %s", err)
+        hass.data.pop(DATA_BEACON_LISTENER, None)
+        return None
+
+    async_close_on_stop(hass, DATA_BEACON_LISTENER, async_close_beacon_listener)
+    return listener
+
+
+@callback
+def async_close_beacon_listener(hass: HomeAssistant) -> None:
+    """Stop listening for discovery beacons."""
+    if (listener := hass.data.pop(DATA_BEACON_LISTENER, None)) is not None:
+        async_cancel_close_on_stop(hass, DATA_BEACON_LISTENER)
+        listener.close()
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update options."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -101,4 +161,5 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     """Set up the Eufy Clean component."""
     # Only config flow is supported
+    async_setup_services(hass)
     return True
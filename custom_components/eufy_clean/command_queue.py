@@ -0,0 +1,111 @@
+"""Queue for commands issued while the device is unreachable."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class QueuedCommand:
+    """DPS values waiting for delivery."""
+
+    commands: dict[str, Any]
+    expires: float
+    # Resolves to True once delivered, or False when the TTL expires
+    future: asyncio.Future[bool]
+    # Expiry timer, armed while the command waits in the queue
+    timer: asyncio.TimerHandle | None = field(default=None, repr=False)
+
+    def arm(self, callback: Callable[[QueuedCommand], None]) -> None:
+        """Call ``callback(self)`` when the TTL runs out."""
+        self.timer = asyncio.get_running_loop().call_at(self.expires, callback, self)
+
+    def disarm(self) -> None:
+        """Cancel the expiry timer."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+
+class OfflineCommandQueue:
+    """Commands kept for ``ttl`` seconds until they can be delivered.
+
+    Pending commands are merged into one DPS dict for delivery, later values
+    for a DPS replacing earlier ones, so the device gets a single frame with
+    the final intent instead of replaying every command.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize the queue."""
+        self.ttl = ttl
+        self._pending: list[QueuedCommand] = []
+
+    def __len__(self) -> int:
+        """Return the number of commands still waiting for delivery."""
+        return sum(not entry.future.done() for entry in self._pending)
+
+    def add(self, commands: dict[str, Any]) -> asyncio.Future[bool]:
+        """Queue DPS values and return the future of their delivery."""
+        loop = asyncio.get_running_loop()
+        entry = QueuedCommand(
+            dict(commands), loop.time() + self.ttl, loop.create_future()
+        )
+        self._pending.append(entry)
+        entry.arm(self._expire)
+        return entry.future
+
+    def _expire(self, entry: QueuedCommand) -> None:
+        """Drop a command whose TTL ran out before delivery."""
+        entry.timer = None
+        # Commands taken for delivery are resolved by the delivery result
+        if entry not in self._pending:
+            return
+        self._pending.remove(entry)
+        if not entry.future.done():
+            _LOGGER.warning(
+                "Dropping command %s: device unreachable for %s seconds",
+                entry.commands,
+                self.ttl,
+            )
+            entry.future.set_result(False)
+
+    def take(self) -> tuple[dict[str, Any], list[QueuedCommand]]:
+        """Remove the pending commands and return them merged per DPS."""
+        batch = [entry for entry in self._pending if not entry.future.done()]
+        for entry in self._pending:
+            entry.disarm()
+        self._pending.clear()
+
+        merged: dict[str, Any] = {}
+        for entry in batch:
+            merged.update(entry.commands)
+        return merged, batch
+
+    def restore(self, batch: list[QueuedCommand]) -> None:
+        """Put back commands whose delivery failed, ahead of newer ones."""
+        loop = asyncio.get_running_loop()
+        self._pending[:0] = batch
+        for entry in batch:
+            if entry.expires <= loop.time():
+                self._expire(entry)
+            else:
+                entry.arm(self._expire)
+
+    def clear(self) -> None:
+        """Fail every pending command."""
+        _, batch = self.take()
+        self.resolve(batch, False)
+
+    @staticmethod
+    def resolve(batch: list[QueuedCommand], delivered: bool) -> None:
+        """Resolve the futures of a delivered or abandoned batch."""
+        for entry in batch:
+            entry.disarm()
+            if not entry.future.done():
+                entry.future.set_result(delivered)
@@ -13,8 +13,24 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import CONF_DEVICE_ID, CONF_DEVICE_IP, CONF_LOCAL_KEY, CONF_MODEL, DOMAIN
+from .const import (
+    CONF_COMMAND_QUEUE_TTL,
+    CONF_DEVICE_ID,
+    CONF_DEVICE_IP,
+    CONF_LOCAL_KEY,
+    CONF_MODEL,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    DEFAULT_COMMAND_QUEUE_TTL,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_PROXY_PORT,
+    DOMAIN,
+    MAX_COMMAND_QUEUE_TTL,
+)
+from .device_profile import get_device_profile
 from .eufy_api import EufyCloudAPI
+from .executor import async_get_io_executor
+from .scenes import SceneCatalogue, parse_scenes
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -96,7 +112,7 @@ async def validate_auth(
             )
             raise ValueError("No vacuum devices found")
 
-        return {"devices": vacuum_devices}
+        return {"devices": vacuum_devices, "api": api}
     except aiohttp.ClientError as err:
         _LOGGER.error("Connection error: %s", err)
         raise ValueError("Cannot connect to Eufy Cloud") from err
@@ -105,19 +121,39 @@ async def validate_auth(
         raise
 
 
+async def async_fetch_scenes(
+    hass: HomeAssistant, api: EufyCloudAPI, device_id: str, force: bool = False
+) -> None:
+    """Fetch the cleaning scenes of a device into its stored catalogue.
+
+    Unless forced, a catalogue fetched within the TTL is kept as is.
+    """
+    catalogue = SceneCatalogue(hass, device_id)
+    await catalogue.async_load()
+    if not force and not catalogue.expired:
+        return
+
+    scenes = parse_scenes(await api.async_get_scenes(device_id))
+    if await catalogue.async_update(scenes):
+        _LOGGER.info("Fetched %d cleaning scenes of %s", len(scenes), device_id)
+    else:
+        _LOGGER.debug("Cleaning scenes of %s are unchanged", device_id)
+
+
 async def discover_device_ip(hass: HomeAssistant, device_id: str) -> str | None:
     """Try to discover device IP on local network using tinytuya scanner."""
     try:
-        import tinytuya
-
         _LOGGER.info("Scanning local network for device %s...", device_id)
 
-        # Run scanner in executor to avoid blocking
+        # Run scanner (and the tinytuya import) in executor to avoid blocking
         def scan():
+            import tinytuya
+
             devices = tinytuya.deviceScan(False, 20)
             return devices
 
-        devices = await hass.async_add_executor_job(scan)
+        # Keep the 20 s scan off HA's shared executor
+        devices = await async_get_io_executor(hass).async_run(scan)
 
         # Look for our device
         for dev in devices:
@@ -145,6 +181,7 @@ class EufyCleanConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._email: str | None = None
         self._password: str | None = None
         self._selected_device: dict[str, Any] | None = None
+        self._cloud_api: EufyCloudAPI | None = None
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -159,6 +196,7 @@ class EufyCleanConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
                 self._devices = info["devices"]
+                self._cloud_api = info.get("api")
                 self._email = user_input[CONF_EMAIL]
                 self._password = user_input[CONF_PASSWORD]
 
@@ -289,6 +327,19 @@ class EufyCleanConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         await self.async_set_unique_id(device["device_id"])
         self._abort_if_unique_id_configured()
 
+        # Cache the cleaning scenes while logged in, so starting one never
+        # needs the cloud
+        if (
+            self._cloud_api is not None
+            and get_device_profile(device.get("model")).scene_dps is not None
+        ):
+            try:
+                await async_fetch_scenes(
+                    self.hass, self._cloud_api, device["device_id"]
+                )
+            except Exception as err:
+                _LOGGER.debug("No cleaning scenes for %s: %s", device["name"], err)
+
         return self.async_create_entry(
             title=device["name"],
             data={
@@ -317,7 +368,13 @@ class EufyCleanOptionsFlowHandler(config_entries.OptionsFlow):
         """Manage the options."""
         errors: dict[str, str] = {}
 
-        if user_input is not None:
+        # Credentials are only used to refresh the scenes, never stored
+        if user_input is not None and user_input.get(CONF_EMAIL):
+            errors = await self._async_refresh_scenes(
+                user_input[CONF_EMAIL], user_input.get(CONF_PASSWORD, "")
+            )
+
+        if user_input is not None and not errors:
             device_ip = user_input.get(CONF_DEVICE_IP)
 
             if device_ip:
@@ -347,16 +404,26 @@ class EufyCleanOptionsFlowHandler(config_entries.OptionsFlow):
                         await self.hass.config_entries.async_reload(
                             self.config_entry.entry_id
                         )
-                        return self.async_create_entry(title="", data={})
+                        return self.async_create_entry(
+                            title="", data=self._options(user_input)
+                        )
                 except ValueError:
                     errors["base"] = "invalid_ip"
             else:
-                # No IP provided, just close options
-                return self.async_create_entry(title="", data={})
+                # No IP provided, just store the options
+                return self.async_create_entry(title="", data=self._options(user_input))
 
         # Get current device IP from config entry
         current_ip = self.config_entry.data.get(CONF_DEVICE_IP)
 
+        # Only models taking scene commands get the scene refresh
+        scene_fields: dict[Any, Any] = {}
+        if get_device_profile(self.config_entry.data.get(CONF_MODEL)).scene_dps:
+            scene_fields = {
+                vol.Optional(CONF_EMAIL): str,
+                vol.Optional(CONF_PASSWORD): str,
+            }
+
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
@@ -365,6 +432,27 @@ class EufyCleanOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_DEVICE_IP,
                         default=current_ip,
                     ): str,
+                    vol.Optional(
+                        CONF_COMMAND_QUEUE_TTL,
+                        default=self.config_entry.options.get(
+                            CONF_COMMAND_QUEUE_TTL, DEFAULT_COMMAND_QUEUE_TTL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_COMMAND_QUEUE_TTL)
+                    ),
+                    vol.Optional(
+                        CONF_PROXY_PORT,
+                        default=self.config_entry.options.get(
+                            CONF_PROXY_PORT, DEFAULT_PROXY_PORT
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                    vol.Optional(
+                        CONF_PROXY_HOST,
+                        default=self.config_entry.options.get(
+                            CONF_PROXY_HOST, DEFAULT_PROXY_HOST
+                        ),
+                    ): str,
+                    **scene_fields,
                 }
             ),
             errors=errors,
@@ -372,3 +460,28 @@ class EufyCleanOptionsFlowHandler(config_entries.OptionsFlow):
                 "current_ip": current_ip or "Unbekannt",
             },
         )
+
+    async def _async_refresh_scenes(self, email: str, password: str) -> dict[str, str]:
+        """Fetch the cleaning scenes again and return the form errors."""
+        api = EufyCloudAPI(async_get_clientsession(self.hass))
+        try:
+            await api.async_login(email, password)
+            await async_fetch_scenes(
+                self.hass, api, self.config_entry.data[CONF_DEVICE_ID], force=True
+            )
+        except (aiohttp.ClientError, ValueError) as err:
+            _LOGGER.error("Cannot refresh cleaning scenes: %s", err)
+            return {"base": "cannot_connect"}
+        return {}
+
+    def _options(self, user_input: dict[str, Any]) -> dict[str, Any]:
+        """Return the entry options from the submitted form."""
+        defaults = {
+            CONF_COMMAND_QUEUE_TTL: DEFAULT_COMMAND_QUEUE_TTL,
+            CONF_PROXY_PORT: DEFAULT_PROXY_PORT,
+            CONF_PROXY_HOST: DEFAULT_PROXY_HOST,
+        }
+        return {
+            key: user_input.get(key, self.config_entry.options.get(key, default))
+            for key, default in defaults.items()
+        }
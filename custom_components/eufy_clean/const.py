@@ -9,14 +9,98 @@ CONF_DEVICE_ID: Final = "device_id"
 CONF_LOCAL_KEY: Final = "local_key"
 CONF_DEVICE_IP: Final = "device_ip"
 CONF_MODEL: Final = "model"
+CONF_COMMAND_QUEUE_TTL: Final = "command_queue_ttl"
+CONF_PROXY_PORT: Final = "proxy_port"
+CONF_PROXY_HOST: Final = "proxy_host"
 
 # Defaults
 DEFAULT_SCAN_INTERVAL: Final = 30
 DEFAULT_TIMEOUT: Final = 10
 
+# Device timeouts: socket timeouts are derived from the measured RTT
+# (p99 x multiplier, clamped) and every call has an end-to-end budget
+RTT_WINDOW: Final = 64
+RTT_MIN_SAMPLES: Final = 5
+RTT_TIMEOUT_MULTIPLIER: Final = 4.0
+MIN_SOCKET_TIMEOUT: Final = 1.0
+MAX_SOCKET_TIMEOUT: Final = 5.0
+SOCKET_RETRY_LIMIT: Final = 1
+STATUS_BUDGET: Final = 8.0
+COMMAND_BUDGET: Final = 10.0
+# Status results younger than this are shared instead of re-queried
+STATUS_FRESHNESS: Final = 0.5
+# Polls query only the volatile DPS, with a full query every N polls
+FULL_REFRESH_INTERVAL: Final = 10
+# Seconds commands wait for an unreachable device (0 disables the queue)
+DEFAULT_COMMAND_QUEUE_TTL: Final = 0
+MAX_COMMAND_QUEUE_TTL: Final = 3600
+# Port of the local proxy sharing the device session (0 disables it), and
+# the address it binds: loopback unless other hosts are allowed in
+DEFAULT_PROXY_PORT: Final = 0
+DEFAULT_PROXY_HOST: Final = "127.0.0.1"
+
+# Shared resources closed on HA stop: the stop listener of each, by key
+DATA_STOP_LISTENERS: Final = f"{DOMAIN}_stop_listeners"
+
+# Device I/O executor
+DATA_IO_EXECUTOR: Final = f"{DOMAIN}_io_executor"
+DEFAULT_IO_WORKERS: Final = 8
+DEFAULT_IO_MAX_QUEUED: Final = 16
+
+# Device health: polls back off exponentially once a device is offline
+OFFLINE_AFTER_FAILURES: Final = 3
+MAX_SCAN_INTERVAL: Final = 600
+OFFLINE_LOG_INTERVAL: Final = 900
+
+# Discovery beacons broadcast by Tuya devices (protocol 3.3+)
+DATA_BEACON_LISTENER: Final = f"{DOMAIN}_beacon_listener"
+DISCOVERY_PORT: Final = 6667
+
+# Services and raw DPS writes
+SERVICE_SEND_DPS: Final = "send_dps"
+SERVICE_FLEET_COMMAND: Final = "fleet_command"
+ATTR_DPS: Final = "dps"
+ATTR_COMMAND: Final = "command"
+ATTR_PARALLELISM: Final = "parallelism"
+ATTR_STAGGER: Final = "stagger"
+ATTR_RETRIES: Final = "retries"
+COMMAND_SET_DPS: Final = "set_dps"
+FLEET_COMMANDS: Final = ("start", "stop", "pause", "return_to_base", COMMAND_SET_DPS)
+
+# Fleet dispatch: devices commanded at once, seconds between starts, and
+# extra rounds for devices that failed
+DEFAULT_FLEET_PARALLELISM: Final = 4
+DEFAULT_FLEET_STAGGER: Final = 0.5
+DEFAULT_FLEET_RETRIES: Final = 1
+
+# History queries: DPS changes returned at most
+SERVICE_GET_HISTORY: Final = "get_history"
+ATTR_START: Final = "start"
+ATTR_END: Final = "end"
+ATTR_INCLUDE_DPS: Final = "include_dps"
+ATTR_LIMIT: Final = "limit"
+DEFAULT_HISTORY_LIMIT: Final = 1000
+
+# Cleaning scenes of X10/S1-class robots: the select entity and service
+# starting one, and how long a fetched scene list is trusted (30 days)
+SERVICE_SCENE_CLEAN: Final = "scene_clean"
+ATTR_SCENE: Final = "scene"
+SCENE_TTL: Final = 30 * 24 * 3600
+
+# Storage
+STORAGE_VERSION: Final = 1
+STORAGE_KEY_STATUS: Final = f"{DOMAIN}.status"
+STORAGE_SAVE_DELAY: Final = 10
+# Directory under .storage with the binary history log of every robot
+STORAGE_KEY_HISTORY: Final = f"{DOMAIN}.history"
+STORAGE_KEY_SCENES: Final = f"{DOMAIN}.scenes"
+
 # Tuya Protocol
 TUYA_PORT: Final = 6668
 TUYA_VERSION: Final = "3.3"
+# tinytuya error codes of a device that was not reached: connect failed,
+# no answer in time, device offline
+TUYA_CONNECTION_ERRORS: Final = frozenset({"901", "902", "905"})
 
 # Eufy Cloud API - Offizielle Android App Endpunkte
 EUFY_API_BASE: Final = "https://home-api.eufylife.com/v1/"
@@ -3,14 +3,31 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import timedelta
+from pathlib import Path
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    STATE_CHARGING,
+    STATE_CLEANING,
+    STATE_DOCKED,
+    STATE_IDLE,
+    STORAGE_KEY_HISTORY,
+    STORAGE_KEY_STATUS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
 from .eufy_api import EufyCleanAPI
+from .history import HistoryLog
+from .scenes import SceneCatalogue
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +42,20 @@ class EufyCleanDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     ) -> None:
         """Initialize the coordinator."""
         self.api = api
+        self.stale = False
+        self.last_seen: str | None = None
+        self.history = HistoryLog(
+            Path(
+                hass.config.path(
+                    STORAGE_DIR, STORAGE_KEY_HISTORY, f"{api.device_id}.log"
+                )
+            )
+        )
+        self.scenes = SceneCatalogue(hass, api.device_id)
+        api.async_add_dps_listener(self._async_dps_changed)
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY_STATUS}.{api.device_id}"
+        )
 
         super().__init__(
             hass,
@@ -33,14 +64,137 @@ class EufyCleanDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
 
+    async def async_restore_status(self) -> None:
+        """Load the last known status, history and scenes saved before."""
+        await self.scenes.async_load()
+        if self.scenes.scenes and self.scenes.expired:
+            _LOGGER.info(
+                "Scene list of %s is out of date; refresh it from the options",
+                self.api.device_id,
+            )
+        try:
+            await self.hass.async_add_executor_job(self.history.open)
+        except OSError as err:
+            _LOGGER.warning("Cannot open history of %s: %s", self.api.device_id, err)
+
+        stored = await self._store.async_load()
+        if not stored or self.data is not None:
+            return
+
+        _LOGGER.debug(
+            "Restored last known status of %s from %s",
+            self.api.device_id,
+            stored.get("updated_at"),
+        )
+        # Raw DPS are not persisted; the first poll fills them in
+        self.data = {**stored["status"], "raw_dps": {}}
+        self.last_seen = stored.get("updated_at")
+        self.stale = True
+
+    async def async_connect_and_refresh(self) -> None:
+        """Open the device connection and fetch the first status."""
+        _LOGGER.info(
+            "Connecting to device at %s (ID: %s)",
+            self.api.device_ip,
+            self.api.device_id,
+        )
+        try:
+            await self.api.async_connect()
+        except Exception as err:
+            _LOGGER.warning(
+                "Error connecting to Eufy Clean device at %s: %s",
+                self.api.device_ip,
+                err,
+            )
+
+        await self.async_refresh()
+
+        if not self.last_update_success:
+            _LOGGER.warning(
+                "Unable to connect to device at %s. Please check: "
+                "1) Device is powered on, "
+                "2) Device is connected to WiFi, "
+                "3) IP address is correct, "
+                "4) Device and Home Assistant are on the same network",
+                self.api.device_ip,
+            )
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the device."""
         try:
             status = await self.api.async_get_status()
+            # Back off while the device is offline
+            self.update_interval = timedelta(seconds=self.api.health.poll_interval)
 
             if status is None:
                 raise UpdateFailed("Failed to get device status")
-
-            return status
+        except UpdateFailed:
+            raise
         except Exception as err:
             raise UpdateFailed(f"Error communicating with device: {err}") from err
+
+        self._track_run(status)
+        await self.async_flush_history()
+        self.last_seen = dt_util.utcnow().isoformat()
+        if self.stale or self._status_changed(status):
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+        self.stale = False
+
+        return status
+
+    @callback
+    def async_device_seen(self, ip: str) -> None:
+        """Poll an unreachable device as soon as its beacon is seen."""
+        if not self.api.health.wake():
+            return
+        _LOGGER.debug(
+            "Beacon from %s (%s) while %s, polling now",
+            self.api.device_id,
+            ip,
+            self.api.health.state,
+        )
+        self.update_interval = timedelta(seconds=self.api.health.poll_interval)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    async def async_flush_history(self) -> None:
+        """Append the buffered history records to the log."""
+        try:
+            await self.hass.async_add_executor_job(self.history.flush)
+        except OSError as err:
+            _LOGGER.warning("Cannot write history of %s: %s", self.api.device_id, err)
+
+    @callback
+    def _async_dps_changed(self, dps: dict[str, Any]) -> None:
+        """Log DPS changes pushed by the device."""
+        self.history.record_dps(time.time(), dps)
+
+    def _track_run(self, status: dict[str, Any]) -> None:
+        """Record the session of a cleaning run.
+
+        Pausing or returning to the dock continues the run.
+        """
+        state = status.get("state")
+        history = self.history
+        if state == STATE_CLEANING and history.session is None:
+            history.start_session(time.time(), status.get("battery"))
+        elif state in (STATE_CHARGING, STATE_DOCKED, STATE_IDLE):
+            if history.session is None:
+                return
+            history.end_session(time.time(), status.get("battery"))
+        if (error_code := status.get("error_code", "0")) != "0":
+            history.record_error(error_code)
+
+    def _status_changed(self, status: dict[str, Any]) -> bool:
+        """Return True if a parsed field differs from the current data."""
+        if self.data is None:
+            return True
+        return any(
+            self.data.get(key) != value
+            for key, value in status.items()
+            if key != "raw_dps"
+        )
+
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the parsed status to persist, without the raw DPS."""
+        status = {key: value for key, value in self.data.items() if key != "raw_dps"}
+        return {"status": status, "updated_at": self.last_seen}
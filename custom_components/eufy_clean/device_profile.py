@@ -0,0 +1,96 @@
+"""Data point (DPS) profiles for the supported RoboVac model families."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from .const import (
+    DPS_BATTERY,
+    DPS_ERROR_CODE,
+    DPS_FAN_SPEED,
+    DPS_FAN_SPEED_OLD,
+    DPS_FIND_ROBOT,
+    DPS_MODE,
+    DPS_POWER,
+    DPS_RETURN_HOME,
+    DPS_STATUS,
+)
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    """DPS layout of a RoboVac model family."""
+
+    name: str
+    # Every DPS the device is known to report
+    dps: tuple[str, ...]
+    # DPS that change on their own while the robot works; the rest only
+    # change on commands and are fetched by the periodic full query
+    volatile_dps: tuple[str, ...] = ()
+    # DPS accepted by raw writes, with the value types each one takes
+    writable_dps: Mapping[str, tuple[type, ...]] = field(default_factory=dict)
+    # DPS taking the id of a cloud cleaning scene to start
+    scene_dps: str | None = None
+
+    def validate_dps(self, dps: Mapping[Any, Any]) -> dict[str, Any]:
+        """Return a raw DPS write keyed by DPS id, or raise ValueError."""
+        if not dps:
+            raise ValueError("No DPS values given")
+
+        validated: dict[str, Any] = {}
+        for key, value in dps.items():
+            dp = str(key)
+            if (types := self.writable_dps.get(dp)) is None:
+                raise ValueError(f"DPS {dp} is not writable on {self.name} devices")
+            # bool is an int subclass, so compare exact types
+            if type(value) not in types:
+                expected = " or ".join(t.__name__ for t in types)
+                raise ValueError(
+                    f"DPS {dp} takes {expected}, got {type(value).__name__}"
+                )
+            validated[dp] = value
+        return validated
+
+
+DEFAULT_PROFILE = DeviceProfile(
+    name="default",
+    dps=(
+        DPS_POWER,
+        DPS_MODE,
+        DPS_RETURN_HOME,
+        DPS_STATUS,
+        DPS_FIND_ROBOT,
+        DPS_FAN_SPEED,
+        DPS_BATTERY,
+        DPS_ERROR_CODE,
+    ),
+    volatile_dps=(DPS_STATUS, DPS_BATTERY, DPS_ERROR_CODE),
+    writable_dps={
+        DPS_POWER: (bool,),
+        DPS_MODE: (int, str),
+        DPS_RETURN_HOME: (bool,),
+        # Fan speed on older models, scene id on newer ones
+        DPS_FAN_SPEED_OLD: (int, str),
+        DPS_FIND_ROBOT: (bool,),
+        DPS_FAN_SPEED: (int, str),
+    },
+)
+
+# X10 Pro Omni and S1 Pro start a cleaning scene from the app when its id
+# is written to DPS 5, the fan speed DPS of older models
+SCENE_PROFILE = replace(DEFAULT_PROFILE, name="X10/S1", scene_dps=DPS_FAN_SPEED_OLD)
+
+# Profiles by the model code the cloud reports, e.g. "T2351"
+MODEL_PROFILES: dict[str, DeviceProfile] = {
+    "T2080": SCENE_PROFILE,  # S1 Pro
+    "T2351": SCENE_PROFILE,  # X10 Pro Omni
+}
+
+
+def get_device_profile(model: str | None) -> DeviceProfile:
+    """Return the DPS profile for a device model."""
+    if not model:
+        return DEFAULT_PROFILE
+    return MODEL_PROFILES.get(model.strip().upper()[:5], DEFAULT_PROFILE)
@@ -0,0 +1,32 @@
+"""Diagnostics support for Eufy Clean."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_LOCAL_KEY, DATA_IO_EXECUTOR, DOMAIN
+from .coordinator import EufyCleanDataUpdateCoordinator
+
+TO_REDACT = {CONF_LOCAL_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: EufyCleanDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    executor = hass.data.get(DATA_IO_EXECUTOR)
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "status": coordinator.data,
+        "stale": coordinator.stale,
+        "last_seen": coordinator.last_seen,
+        "rtt": coordinator.api.rtt.as_dict(),
+        "health": coordinator.api.health.as_dict(),
+        "io_executor": executor.metrics if executor else None,
+    }
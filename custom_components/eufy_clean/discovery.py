@@ -0,0 +1,100 @@
+"""Listener for the UDP discovery beacons broadcast by Tuya devices."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from .const import DISCOVERY_PORT
+from .executor import DeviceIOExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _load_decrypt() -> Callable[[bytes], str]:
+    """Import tinytuya's beacon decryption (blocking)."""
+    import tinytuya
+
+    return tinytuya.decrypt_udp
+
+
+class BeaconListener(asyncio.DatagramProtocol):
+    """Call back registered devices when their discovery beacon arrives.
+
+    Devices broadcast a beacon every few seconds while they are on the
+    network, so a beacon from a device that stopped answering polls is the
+    earliest sign that it came back. tinytuya's decryption is imported in
+    the executor when the first beacon arrives, not during setup; beacons
+    arriving before it is loaded are dropped.
+    """
+
+    def __init__(self, port: int = DISCOVERY_PORT) -> None:
+        """Initialize the listener."""
+        self.port = port
+        self._callbacks: dict[str, list[Callable[[str], None]]] = {}
+        self._decrypt: Callable[[bytes], str] | None = None
+        self._executor: DeviceIOExecutor | None = None
+        self._loading: asyncio.Task[None] | None = None
+        self._transport: asyncio.DatagramTransport | None = None
+
+    async def async_start(self, executor: DeviceIOExecutor) -> None:
+        """Bind the beacon port."""
+        self._executor = executor
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: self, local_addr=("0.0.0.0", self.port), reuse_port=True
+        )
+
+    def register(
+        self, device_id: str, callback: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """Call ``callback(ip)`` on beacons of a device; return the remover."""
+        self._callbacks.setdefault(device_id, []).append(callback)
+
+        def remove() -> None:
+            callbacks = self._callbacks[device_id]
+            callbacks.remove(callback)
+            if not callbacks:
+                del self._callbacks[device_id]
+
+        return remove
+
+    def datagram_received(self, data: bytes, addr: tuple[str, Any]) -> None:
+        """Dispatch a beacon to the callbacks of its device."""
+        if not self._callbacks:
+            return
+        if self._decrypt is None:
+            if self._loading is None and self._executor is not None:
+                self._loading = asyncio.get_running_loop().create_task(
+                    self._async_load_decrypt(self._executor)
+                )
+            return
+        try:
+            beacon = json.loads(self._decrypt(data))
+        except Exception as err:
+            _LOGGER.debug("Ignoring undecodable beacon from %s: %s", addr[0], err)
+            return
+
+        for callback in tuple(self._callbacks.get(beacon.get("gwId"), ())):
+            callback(beacon.get("ip", addr[0]))
+
+    async def _async_load_decrypt(self, executor: DeviceIOExecutor) -> None:
+        """Import the beacon decryption, retried on the next beacon if it fails."""
+        try:
+            self._decrypt = await executor.async_run(_load_decrypt)
+        except Exception as err:
+            _LOGGER.debug("Cannot load beacon decryption: %s", err)
+        finally:
+            self._loading = None
+
+    def close(self) -> None:
+        """Unbind the beacon port."""
+        if self._loading is not None:
+            self._loading.cancel()
+            self._loading = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, TypeVar
 from urllib.parse import urljoin
 
 import aiohttp
-import tinytuya
 
+from .command_queue import OfflineCommandQueue
 from .const import (
+    COMMAND_BUDGET,
+    DEFAULT_TIMEOUT,
     DPS_BATTERY,
     DPS_ERROR_CODE,
     DPS_FAN_SPEED,
@@ -21,18 +26,33 @@ from .const import (
     EUFY_API_BASE,
     EUFY_API_LOGIN,
     EUFY_CLIENTS,
+    FULL_REFRESH_INTERVAL,
+    SOCKET_RETRY_LIMIT,
     STATE_CHARGING,
     STATE_CLEANING,
     STATE_DOCKED,
     STATE_IDLE,
     STATE_PAUSED,
     STATE_RETURNING,
+    STATUS_BUDGET,
+    STATUS_FRESHNESS,
+    TUYA_CONNECTION_ERRORS,
     TUYA_VERSION,
 )
+from .device_profile import DEFAULT_PROFILE, DeviceProfile
+from .executor import DeviceIOExecutor, ExecutorSaturatedError
+from .health import HealthTracker
+from .scheduler import DeviceRequestScheduler, RequestDroppedError
+from .timing import RttEstimator
 from .tuya_api import TuyaAPIClient
 
+if TYPE_CHECKING:
+    import tinytuya
+
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 class EufyCloudAPI:
     """Eufy Cloud API client for authentication and key extraction via Tuya."""
@@ -69,7 +89,10 @@ class EufyCloudAPI:
                 url = urljoin(self._base_url, EUFY_API_LOGIN)
                 _LOGGER.debug("Login URL: %s", url)
                 async with self.session.post(
-                    url, json=data, headers=headers, timeout=10
+                    url,
+                    json=data,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
                 ) as response:
                     result = await response.json()
 
@@ -184,6 +207,15 @@ class EufyCloudAPI:
             _LOGGER.error("Failed to get devices from Tuya API: %s", err)
             raise
 
+    async def async_get_scenes(self, device_id: str) -> Any:
+        """Get the raw cleaning scene list of a device from Tuya API."""
+        if not self._token or not self._tuya_client:
+            raise ValueError("Not authenticated - call async_login first")
+
+        scenes = await self._tuya_client.list_scenes(device_id)
+        _LOGGER.debug("Fetched scene list for device %s: %s", device_id, scenes)
+        return scenes
+
 
 class EufyCleanAPI:
     """Eufy Clean local API client using Tuya protocol."""
@@ -193,72 +225,351 @@ class EufyCleanAPI:
         device_id: str,
         local_key: str,
         device_ip: str,
+        profile: DeviceProfile = DEFAULT_PROFILE,
+        executor: DeviceIOExecutor | None = None,
+        command_queue_ttl: float = 0,
     ) -> None:
-        """Initialize the Eufy Clean API client."""
+        """Initialize the Eufy Clean API client.
+
+        With a ``command_queue_ttl``, commands the device cannot take right
+        away wait up to that many seconds for it to become reachable.
+        """
         self.device_id = device_id
         self.local_key = local_key
         self.device_ip = device_ip
+        self.profile = profile
+        self._executor = executor
         self._device: tinytuya.Device | None = None
-        self._lock = asyncio.Lock()
-
-    async def async_connect(self) -> None:
+        self._scheduler = DeviceRequestScheduler(self._async_run, self._interrupt_io)
+        self.rtt = RttEstimator()
+        self.health = HealthTracker()
+        # Last DPS values reported by the device, merged across responses
+        self._dps: dict[str, Any] = {}
+        self._dps_listeners: list[Callable[[dict[str, Any]], None]] = []
+        # Single-flight status query shared by concurrent callers
+        self._status_task: asyncio.Task[dict[str, Any] | None] | None = None
+        self._status: dict[str, Any] | None = None
+        self._status_time = 0.0
+        # Targeted polls of the volatile DPS until the next full query
+        self._partial_query = bool(profile.volatile_dps)
+        self._polls_until_full = 0
+        # Commands waiting for the device to become reachable
+        self._command_queue = (
+            OfflineCommandQueue(command_queue_ttl) if command_queue_ttl > 0 else None
+        )
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def dps(self) -> dict[str, Any]:
+        """Return the last known value of every DPS."""
+        return dict(self._dps)
+
+    def async_add_dps_listener(
+        self, listener: Callable[[dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """Call ``listener(changed_dps)`` on DPS changes; return the remover."""
+        self._dps_listeners.append(listener)
+        return lambda: self._dps_listeners.remove(listener)
+
+    async def _async_run(
+        self, func: Callable[..., _T], *args: Any, sheddable: bool = False
+    ) -> _T:
+        """Run blocking device I/O in the integration's executor."""
+        if self._executor is None:
+            return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+        return await self._executor.async_run(func, *args, sheddable=sheddable)
+
+    def _interrupt_io(self) -> None:
+        """Abort the blocking call in flight by shutting down its socket.
+
+        The blocked recv returns immediately and tinytuya reconnects on the
+        next request, so a command waits one reconnect instead of a timeout.
+        """
+        sock = getattr(self._device, "socket", None)
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _deadline(deadline: float | None, budget: float) -> float:
+        """Return the given deadline or one ``budget`` seconds from now."""
+        return deadline if deadline is not None else time.monotonic() + budget
+
+    def _call_with_deadline(
+        self, deadline: float, func: Callable[..., _T], *args: Any
+    ) -> _T:
+        """Run a blocking tinytuya call so it ends before the deadline."""
+        if deadline - time.monotonic() <= 0:
+            raise TimeoutError("Deadline expired before the request was sent")
+        if self._device is not None:
+            self._device.set_socketTimeout(self._socket_timeout(deadline))
+
+        start = time.monotonic()
+        result = func(*args)
+        if isinstance(result, dict) and not result.get("Err"):
+            self.rtt.add_sample(time.monotonic() - start)
+        return result
+
+    def _socket_timeout(self, deadline: float) -> float:
+        """Return the socket timeout of one attempt ending before the deadline.
+
+        What is left is split between the attempt and tinytuya's retries.
+        """
+        remaining = max(deadline - time.monotonic(), 0.0)
+        return min(self.rtt.timeout, remaining / (SOCKET_RETRY_LIMIT + 1))
+
+    async def _async_request(
+        self,
+        submit: Callable[..., Awaitable[_T]],
+        deadline: float,
+        func: Callable[..., _T],
+        *args: Any,
+    ) -> _T:
+        """Submit a blocking call to the scheduler, bounded by the deadline."""
+        async with asyncio.timeout(deadline - time.monotonic()):
+            return await submit(self._call_with_deadline, deadline, func, *args)
+
+    async def async_connect(self, deadline: float | None = None) -> None:
         """Connect to the device."""
-        await asyncio.get_event_loop().run_in_executor(None, self._connect)
+        deadline = self._deadline(deadline, STATUS_BUDGET)
+        await self._async_request(
+            self._scheduler.async_command, deadline, self._connect, deadline
+        )
 
-    def _connect(self) -> None:
-        """Connect to the device (blocking)."""
+    async def _async_device(self, deadline: float) -> tinytuya.Device:
+        """Return the device, connecting to it first if needed."""
+        if self._device is None:
+            await self.async_connect(deadline)
+        if self._device is None:
+            raise ConnectionError(f"Not connected to {self.device_ip}")
+        return self._device
+
+    def _connect(self, deadline: float) -> None:
+        """Connect to the device within the deadline (blocking)."""
+        # Imported here so the import cost is paid in the executor on first
+        # connect instead of on the event loop when HA loads the integration
+        import tinytuya
+
+        timeout = self._socket_timeout(deadline)
         self._device = tinytuya.Device(
             dev_id=self.device_id,
             address=self.device_ip,
             local_key=self.local_key,
             version=float(TUYA_VERSION),
+            connection_timeout=timeout,
         )
         self._device.set_socketPersistent(True)
-        self._device.set_socketTimeout(5)
+        self._device.set_socketTimeout(timeout)
+        # Few retries, so an interrupted poll unwinds quickly and retries
+        # cannot stack socket timeouts beyond the request's deadline
+        self._device.set_socketRetryLimit(SOCKET_RETRY_LIMIT)
+        self._polls_until_full = 0
+        if deadline - time.monotonic() <= 0:
+            _LOGGER.debug("No time left to request a DPS push from %s", self.device_ip)
+            return
+        self._device.set_socketTimeout(self._socket_timeout(deadline))
+        self._request_dps_push()
+
+    def _request_dps_push(self) -> None:
+        """Ask the device to push its DPS and wait for the answer (blocking).
+
+        Some models (e.g. L60) never send their initial DPS packet on their
+        own and stay unavailable until their state changes, so request an
+        UPDATEDPS refresh for every DPS of the profile right after connecting.
+        """
+        if (device := self._device) is None:
+            return
+        try:
+            result = device.updatedps([int(dp) for dp in self.profile.dps])
+            if not isinstance(result, dict) or "dps" not in result:
+                # Some firmware acknowledges first and pushes the values after
+                result = device.receive()
+        except Exception as err:
+            _LOGGER.debug("DPS refresh request to %s failed: %s", self.device_ip, err)
+            return
+
+        if isinstance(result, dict) and "dps" in result:
+            _LOGGER.debug("Initial DPS push: %s", result["dps"])
+            self._dps.update(result["dps"])
 
     async def async_disconnect(self) -> None:
         """Disconnect from the device."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._command_queue is not None:
+            self._command_queue.clear()
         if self._device:
-            await asyncio.get_event_loop().run_in_executor(None, self._device.close)
+            await self._scheduler.async_command(self._device.close)
             self._device = None
 
-    async def async_get_status(self) -> dict[str, Any] | None:
-        """Get current device status."""
-        if not self._device:
-            await self.async_connect()
-
-        async with self._lock:
-            try:
-                status = await asyncio.get_event_loop().run_in_executor(
-                    None, self._device.status
-                )
+    async def async_get_status(
+        self, deadline: float | None = None
+    ) -> dict[str, Any] | None:
+        """Get current device status, giving up at the deadline.
+
+        Concurrent callers share one device query, and a result younger than
+        STATUS_FRESHNESS is returned without querying the device again.
+        """
+        if (
+            self._status is not None
+            and time.monotonic() - self._status_time < STATUS_FRESHNESS
+        ):
+            return self._status
+
+        deadline = self._deadline(deadline, STATUS_BUDGET)
+        if self._status_task is None:
+            self._status_task = asyncio.create_task(self._async_fetch_status(deadline))
+            self._status_task.add_done_callback(self._status_fetched)
 
-                if not status or "dps" not in status:
-                    # Check if it's a device unreachable error
-                    if isinstance(status, dict) and status.get("Err") == "905":
-                        _LOGGER.error(
-                            "Device unreachable at %s. Please verify: "
-                            "1) Device is powered on and connected to WiFi, "
-                            "2) IP address is correct, "
-                            "3) Device is on the same network as Home Assistant",
-                            self.device_ip,
-                        )
-                    else:
-                        _LOGGER.warning("Invalid status response: %s", status)
-                    return None
-
-                dps = status["dps"]
-                _LOGGER.debug("Raw DPS data: %s", dps)
-
-                return self._parse_status(dps)
-            except Exception as err:
-                _LOGGER.error(
-                    "Error getting status from %s: %s (Check network connectivity and device power)",
-                    self.device_ip,
-                    err,
-                )
+        try:
+            async with asyncio.timeout(deadline - time.monotonic()):
+                return await asyncio.shield(self._status_task)
+        except TimeoutError:
+            self._log_poll_failure(
+                logging.WARNING,
+                "Status request to %s did not finish within its deadline",
+                self.device_ip,
+            )
+            return None
+
+    def _status_fetched(self, task: asyncio.Task[dict[str, Any] | None]) -> None:
+        """Cache the result of the shared status query."""
+        self._status_task = None
+        if not task.cancelled() and (status := task.result()) is not None:
+            self._status = status
+            self._status_time = time.monotonic()
+
+    async def _async_fetch_status(self, deadline: float) -> dict[str, Any] | None:
+        """Query the device status."""
+        try:
+            device = await self._async_device(deadline)
+
+            full = not self._partial_query or self._polls_until_full <= 0
+            status = await self._async_request(
+                self._scheduler.async_poll,
+                deadline,
+                device.status if full else self._query_volatile_dps,
+            )
+
+            if (not status or "dps" not in status) and not (
+                isinstance(status, dict) and status.get("Err")
+            ):
+                # Empty answer: fall back to the values pushed by the device
+                status = {"dps": {}} if self._dps else status
+
+            if not status or "dps" not in status:
+                # Check if it's a device unreachable error
+                if isinstance(status, dict) and status.get("Err") == "905":
+                    self._log_poll_failure(
+                        logging.ERROR,
+                        "Device unreachable at %s. Please verify: "
+                        "1) Device is powered on and connected to WiFi, "
+                        "2) IP address is correct, "
+                        "3) Device is on the same network as Home Assistant",
+                        self.device_ip,
+                    )
+                else:
+                    self._log_poll_failure(
+                        logging.WARNING, "Invalid status response: %s", status
+                    )
+                self.health.record_failure()
                 return None
 
+            if self.health.record_success():
+                _LOGGER.info("Device at %s is reachable again", self.device_ip)
+            changed = {
+                dp: value
+                for dp, value in status["dps"].items()
+                if dp not in self._dps or self._dps[dp] != value
+            }
+            self._dps.update(status["dps"])
+            if changed:
+                for listener in tuple(self._dps_listeners):
+                    try:
+                        listener(changed)
+                    except Exception:
+                        # A listener must not cost the poll its result
+                        _LOGGER.exception("Error in DPS listener of %s", self.device_id)
+            if self._command_queue:
+                # The device answers again: deliver what was queued meanwhile
+                self._schedule_flush()
+            self._polls_until_full = (
+                FULL_REFRESH_INTERVAL if full else self._polls_until_full - 1
+            )
+            dps = dict(self._dps)
+            _LOGGER.debug("Raw DPS data: %s", dps)
+
+            return self._parse_status(dps)
+        except (ExecutorSaturatedError, RequestDroppedError) as err:
+            # Skip the poll and keep reporting the last known values
+            _LOGGER.debug("Skipping status poll of %s: %s", self.device_ip, err)
+            return self._parse_status(dict(self._dps)) if self._dps else None
+        except TimeoutError:
+            self._log_poll_failure(
+                logging.WARNING,
+                "Status request to %s did not finish within its deadline",
+                self.device_ip,
+            )
+            self.health.record_failure()
+            return None
+        except Exception as err:
+            self._log_poll_failure(
+                logging.ERROR,
+                "Error getting status from %s: %s (Check network connectivity and device power)",
+                self.device_ip,
+                err,
+            )
+            self.health.record_failure()
+            return None
+
+    def _log_poll_failure(self, level: int, msg: str, *args: Any) -> None:
+        """Log a failed poll, at debug level if one was logged recently."""
+        if not self.health.should_log():
+            level = logging.DEBUG
+        _LOGGER.log(level, msg, *args)
+
+    def _query_volatile_dps(self) -> dict[str, Any] | None:
+        """Query only the volatile DPS of the profile (blocking).
+
+        Firmware that ignores the DPS list of a targeted DP_QUERY, answering
+        with other DPS, an error or nothing, gets a full query instead, now
+        and for every following poll.
+        """
+        import tinytuya
+
+        if (device := self._device) is None:
+            return None
+        volatile = self.profile.volatile_dps
+        payload = device.generate_payload(tinytuya.DP_QUERY, dict.fromkeys(volatile))
+        device.send(payload)
+        result = device.receive()
+        if (
+            isinstance(result, dict)
+            and isinstance(result.get("dps"), dict)
+            and not result.get("Err")
+        ):
+            if set(result["dps"]) <= set(volatile):
+                return result
+            # All DPS despite the list: a full answer, but stop asking
+            self._partial_query = False
+            _LOGGER.debug(
+                "%s ignores the DPS list of targeted queries, polling all DPS",
+                self.device_ip,
+            )
+            return result
+
+        _LOGGER.debug(
+            "%s does not answer targeted DPS queries (%s), polling all DPS",
+            self.device_ip,
+            result,
+        )
+        self._partial_query = False
+        return device.status()
+
     def _parse_status(self, dps: dict[str, Any]) -> dict[str, Any]:
         """Parse DPS data into friendly format."""
         # Parse power state
@@ -329,40 +640,149 @@ class EufyCleanAPI:
         }
         return speed_map.get(speed_name, 1)
 
-    async def async_start(self) -> bool:
+    async def async_start(self, deadline: float | None = None) -> bool:
         """Start cleaning."""
-        return await self._send_command({DPS_POWER: True, DPS_MODE: 0})
+        return await self._send_command({DPS_POWER: True, DPS_MODE: 0}, deadline)
 
-    async def async_stop(self) -> bool:
+    async def async_stop(self, deadline: float | None = None) -> bool:
         """Stop cleaning."""
-        return await self._send_command({DPS_POWER: False})
+        return await self._send_command({DPS_POWER: False}, deadline)
 
-    async def async_pause(self) -> bool:
+    async def async_pause(self, deadline: float | None = None) -> bool:
         """Pause cleaning."""
-        return await self._send_command({DPS_POWER: False})
+        return await self._send_command({DPS_POWER: False}, deadline)
 
-    async def async_return_to_base(self) -> bool:
+    async def async_return_to_base(self, deadline: float | None = None) -> bool:
         """Return to charging base."""
-        return await self._send_command({DPS_RETURN_HOME: True})
+        return await self._send_command({DPS_RETURN_HOME: True}, deadline)
 
-    async def async_set_fan_speed(self, speed: str) -> bool:
+    async def async_set_fan_speed(
+        self, speed: str, deadline: float | None = None
+    ) -> bool:
         """Set fan speed."""
         speed_value = self._reverse_map_fan_speed(speed)
-        return await self._send_command({DPS_FAN_SPEED: speed_value})
+        return await self._send_command({DPS_FAN_SPEED: speed_value}, deadline)
+
+    async def async_clean_scene(
+        self, scene_id: int, deadline: float | None = None
+    ) -> bool:
+        """Start a cleaning scene, a single local DPS write.
+
+        Raises ValueError if the model takes no scene commands.
+        """
+        if self.profile.scene_dps is None:
+            raise ValueError(f"{self.profile.name} devices do not clean scenes")
+        return await self._send_command({self.profile.scene_dps: scene_id}, deadline)
+
+    async def async_send_dps(
+        self, dps: dict[Any, Any], deadline: float | None = None
+    ) -> bool:
+        """Write raw DPS values validated against the device profile.
+
+        Raises ValueError if a DPS is not writable or has the wrong type.
+        """
+        return await self._send_command(self.profile.validate_dps(dps), deadline)
+
+    async def _send_command(
+        self, commands: dict[str, Any], deadline: float | None = None
+    ) -> bool:
+        """Send command to device, giving up at the deadline.
+
+        With the command queue enabled, a command for an unreachable device
+        waits for the next delivery attempt instead. The result tells
+        whether it was delivered before the deadline; a command still
+        queued then is delivered later unless its TTL expires first.
+        """
+        deadline = self._deadline(deadline, COMMAND_BUDGET)
+        if self._command_queue is None:
+            return bool(await self._deliver_command(commands, deadline))
+
+        future = self._command_queue.add(commands)
+        self._schedule_flush(deadline)
+        try:
+            async with asyncio.timeout(deadline - time.monotonic()):
+                # Shielded, so the command stays queued past the deadline
+                return await asyncio.shield(future)
+        except TimeoutError:
+            return False
+
+    def _schedule_flush(self, deadline: float | None = None) -> None:
+        """Start delivering queued commands unless already in progress."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._async_flush_commands(deadline))
+
+    async def _async_flush_commands(self, deadline: float | None) -> None:
+        """Deliver queued commands, merged into one frame per attempt."""
+        try:
+            while self._command_queue:
+                commands, batch = self._command_queue.take()
+                try:
+                    delivered = await self._deliver_command(commands, deadline)
+                except asyncio.CancelledError:
+                    self._command_queue.resolve(batch, False)
+                    raise
+                # Only commands the device was not reached for are kept
+                if delivered is not None:
+                    self._command_queue.resolve(batch, delivered)
+                    deadline = None
+                    continue
+
+                self._command_queue.restore(batch)
+                _LOGGER.info(
+                    "Queued %d command(s) until %s is reachable again",
+                    len(self._command_queue),
+                    self.device_ip,
+                )
+                return
+        finally:
+            self._flush_task = None
 
-    async def _send_command(self, commands: dict[str, Any]) -> bool:
-        """Send command to device."""
-        if not self._device:
-            await self.async_connect()
+    async def _deliver_command(
+        self, commands: dict[str, Any], deadline: float | None = None
+    ) -> bool | None:
+        """Send DPS values to the device, giving up at the deadline.
 
-        async with self._lock:
-            try:
-                _LOGGER.debug("Sending command: %s", commands)
-                result = await asyncio.get_event_loop().run_in_executor(
-                    None, self._device.set_multiple_values, commands
+        Return True if the device took them, False if it rejected them and
+        None if it was not reached.
+        """
+        deadline = self._deadline(deadline, COMMAND_BUDGET)
+
+        try:
+            device = await self._async_device(deadline)
+
+            _LOGGER.debug("Sending command: %s", commands)
+            result = await self._async_request(
+                self._scheduler.async_command,
+                deadline,
+                device.set_multiple_values,
+                commands,
+            )
+            _LOGGER.debug("Command result: %s", result)
+            if isinstance(result, dict) and result.get("Err"):
+                _LOGGER.error(
+                    "Command %s to %s failed: %s",
+                    commands,
+                    self.device_ip,
+                    result.get("Error", result["Err"]),
                 )
-                _LOGGER.debug("Command result: %s", result)
-                return True
-            except Exception as err:
-                _LOGGER.error("Error sending command: %s", err)
-                return False
+                return None if result["Err"] in TUYA_CONNECTION_ERRORS else False
+            # The cached status predates the command, and the command may
+            # have changed DPS outside the volatile set
+            self._status_time = 0.0
+            self._polls_until_full = 0
+            return True
+        except TimeoutError:
+            _LOGGER.error(
+                "Command %s to %s did not finish within its deadline",
+                commands,
+                self.device_ip,
+            )
+            return None
+        except (OSError, ExecutorSaturatedError, RequestDroppedError) as err:
+            _LOGGER.error(
+                "Command %s to %s not sent: %s", commands, self.device_ip, err
+            )
+            return None
+        except Exception as err:
+            _LOGGER.error("Error sending command: %s", err)
+            return False
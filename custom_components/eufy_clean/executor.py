@@ -0,0 +1,161 @@
+"""Bounded executor for blocking device I/O."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    DATA_IO_EXECUTOR,
+    DATA_STOP_LISTENERS,
+    DEFAULT_IO_MAX_QUEUED,
+    DEFAULT_IO_WORKERS,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when a sheddable job is rejected because the executor is full."""
+
+
+class DeviceIOExecutor:
+    """Thread pool for blocking tinytuya calls, separate from HA's executor.
+
+    Unreachable robots hold a thread for a full socket timeout. Running those
+    calls here keeps them from starving other integrations, and jobs marked
+    sheddable (status polls) are rejected instead of piling up once
+    ``max_queued`` jobs are already waiting for a thread.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_IO_WORKERS,
+        max_queued: int = DEFAULT_IO_MAX_QUEUED,
+    ) -> None:
+        """Initialize the executor."""
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=DOMAIN
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._completed = 0
+        self._shed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def async_run(
+        self, func: Callable[..., _T], *args: Any, sheddable: bool = False
+    ) -> _T:
+        """Run a blocking function in the pool and return its result."""
+        with self._lock:
+            if sheddable and self._queued >= self.max_queued:
+                self._shed += 1
+                raise ExecutorSaturatedError(
+                    f"{self._queued} device I/O jobs already waiting"
+                )
+            self._queued += 1
+
+        submitted = time.monotonic()
+
+        def job() -> _T:
+            waited = time.monotonic() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        future = self._executor.submit(job)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: Future) -> None:
+        """Release the queue slot of a job cancelled before it started."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return saturation metrics."""
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+                "shed": self._shed,
+                "wait_avg_ms": round(self._wait_total / started * 1000, 1)
+                if started
+                else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 1),
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for in-flight socket timeouts."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@callback
+def async_get_io_executor(hass: HomeAssistant) -> DeviceIOExecutor:
+    """Return the device I/O executor shared by all config entries."""
+    if (executor := hass.data.get(DATA_IO_EXECUTOR)) is None:
+        executor = hass.data[DATA_IO_EXECUTOR] = DeviceIOExecutor()
+        async_close_on_stop(hass, DATA_IO_EXECUTOR, async_shutdown_io_executor)
+    return executor
+
+
+@callback
+def async_shutdown_io_executor(hass: HomeAssistant) -> None:
+    """Shut down the shared executor without waiting for socket timeouts."""
+    if (executor := hass.data.pop(DATA_IO_EXECUTOR, None)) is not None:
+        async_cancel_close_on_stop(hass, DATA_IO_EXECUTOR)
+        _LOGGER.debug("Shutting down device I/O executor: %s", executor.metrics)
+        executor.shutdown()
+
+
+@callback
+def async_close_on_stop(
+    hass: HomeAssistant, key: str, close: Callable[[HomeAssistant], None]
+) -> None:
+    """Call ``close(hass)`` on HA stop unless the resource is closed before."""
+
+    @callback
+    def _async_stop(event: Event) -> None:
+        # The listener is gone once it fired
+        hass.data[DATA_STOP_LISTENERS].pop(key, None)
+        close(hass)
+
+    hass.data.setdefault(DATA_STOP_LISTENERS, {})[key] = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_STOP, _async_stop
+    )
+
+
+@callback
+def async_cancel_close_on_stop(hass: HomeAssistant, key: str) -> None:
+    """Remove the stop listener of a resource closed before HA stops."""
+    if (remove := hass.data.get(DATA_STOP_LISTENERS, {}).pop(key, None)) is not None:
+        remove()
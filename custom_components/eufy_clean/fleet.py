@@ -0,0 +1,106 @@
+"""Concurrent, staggered dispatch of one command to many devices."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    DEFAULT_FLEET_PARALLELISM,
+    DEFAULT_FLEET_RETRIES,
+    DEFAULT_FLEET_STAGGER,
+)
+
+
+@dataclass
+class DispatchResult:
+    """Outcome of a command on one device."""
+
+    success: bool = False
+    attempts: int = 0
+    # Seconds taken by the last attempt
+    latency: float = 0.0
+    error: str | None = None
+    # Validation errors fail the same way on every attempt
+    retryable: bool = True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result for a service response."""
+        result: dict[str, Any] = {
+            "success": self.success,
+            "attempts": self.attempts,
+            "latency_ms": round(self.latency * 1000, 1),
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+async def async_dispatch(
+    jobs: Mapping[str, Callable[[], Awaitable[bool]]],
+    parallelism: int = DEFAULT_FLEET_PARALLELISM,
+    stagger: float = DEFAULT_FLEET_STAGGER,
+    retries: int = DEFAULT_FLEET_RETRIES,
+) -> dict[str, DispatchResult]:
+    """Run one job per device and return the result of each.
+
+    At most ``parallelism`` jobs run at once and job starts are spaced
+    ``stagger`` seconds apart, so devices on the same access point do not
+    all reconnect in the same instant. Failed jobs are retried in up to
+    ``retries`` further rounds, dispatched the same way.
+    """
+    results = {key: DispatchResult() for key in jobs}
+    semaphore = asyncio.Semaphore(parallelism)
+
+    async def run(index: int, key: str) -> None:
+        await asyncio.sleep(index * stagger)
+        async with semaphore:
+            await _async_attempt(jobs[key], results[key])
+
+    pending = list(jobs)
+    for _ in range(retries + 1):
+        await asyncio.gather(*(run(index, key) for index, key in enumerate(pending)))
+        pending = [
+            key
+            for key, result in results.items()
+            if not result.success and result.retryable
+        ]
+        if not pending:
+            break
+
+    return results
+
+
+async def _async_attempt(
+    job: Callable[[], Awaitable[bool]], result: DispatchResult
+) -> None:
+    """Run a job once and record its outcome."""
+    result.attempts += 1
+    start = time.monotonic()
+    try:
+        result.success = await job()
+        result.error = None if result.success else "Command not delivered"
+    except ValueError as err:
+        result.success = False
+        result.error = str(err)
+        result.retryable = False
+    result.latency = time.monotonic() - start
+
+
+def summarize(results: Mapping[str, DispatchResult]) -> dict[str, Any]:
+    """Return an aggregated report of a dispatch."""
+    latencies = [result.latency for result in results.values() if result.success]
+    return {
+        "succeeded": len(latencies),
+        "failed": len(results) - len(latencies),
+        "latency_ms": {
+            "avg": round(sum(latencies) / len(latencies) * 1000, 1)
+            if latencies
+            else None,
+            "max": round(max(latencies) * 1000, 1) if latencies else None,
+        },
+        "devices": {key: result.as_dict() for key, result in results.items()},
+    }
@@ -0,0 +1,113 @@
+"""Reachability state machine driving the poll interval of a device."""
+
+from __future__ import annotations
+
+import time
+from enum import StrEnum
+from typing import Any
+
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    OFFLINE_AFTER_FAILURES,
+    OFFLINE_LOG_INTERVAL,
+)
+
+
+class DeviceHealth(StrEnum):
+    """Reachability of a device."""
+
+    ONLINE = "online"
+    DEGRADED = "degraded"
+    OFFLINE = "offline"
+
+
+class HealthTracker:
+    """Track consecutive poll failures of one device.
+
+    The first failure makes the device degraded and ``offline_after`` failures
+    in a row make it offline. While offline the poll interval doubles with
+    every further failure, up to ``max_interval``, and failures are only
+    logged loudly every ``log_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_SCAN_INTERVAL,
+        max_interval: float = MAX_SCAN_INTERVAL,
+        offline_after: int = OFFLINE_AFTER_FAILURES,
+        log_interval: float = OFFLINE_LOG_INTERVAL,
+    ) -> None:
+        """Initialize the tracker."""
+        self.interval = interval
+        self.max_interval = max_interval
+        self.offline_after = offline_after
+        self.log_interval = log_interval
+        self.failures = 0
+        self._last_log: float | None = None
+        self._last_wake: float | None = None
+
+    @property
+    def state(self) -> DeviceHealth:
+        """Return the current reachability state."""
+        if self.failures == 0:
+            return DeviceHealth.ONLINE
+        if self.failures < self.offline_after:
+            return DeviceHealth.DEGRADED
+        return DeviceHealth.OFFLINE
+
+    @property
+    def poll_interval(self) -> float:
+        """Return the seconds until the next poll."""
+        if self.state is not DeviceHealth.OFFLINE:
+            return self.interval
+        backoff = self.interval * 2 ** (self.failures - self.offline_after + 1)
+        return min(backoff, self.max_interval)
+
+    def record_success(self) -> bool:
+        """Record an answer from the device; return True if it was offline."""
+        was_offline = self.state is DeviceHealth.OFFLINE
+        self.failures = 0
+        self._last_log = None
+        return was_offline
+
+    def record_failure(self) -> DeviceHealth:
+        """Record a failed poll and return the new state."""
+        self.failures += 1
+        return self.state
+
+    def should_log(self) -> bool:
+        """Return True if a failure should be logged at its normal level.
+
+        The first failure is always logged; while the device stays
+        unreachable only one failure per ``log_interval`` is.
+        """
+        now = time.monotonic()
+        if self._last_log is not None and now - self._last_log < self.log_interval:
+            return False
+        self._last_log = now
+        return True
+
+    def wake(self) -> bool:
+        """Restart polling at the normal interval after a sign of life.
+
+        Return True if the device should be polled now. Repeated signs of
+        life (beacons arrive every few seconds) wake it once per interval.
+        """
+        if self.state is DeviceHealth.ONLINE:
+            return False
+        now = time.monotonic()
+        if self._last_wake is not None and now - self._last_wake < self.interval:
+            return False
+        self._last_wake = now
+        # Back off from the first step again if the device still fails
+        self.failures = min(self.failures, self.offline_after - 1)
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state for diagnostics."""
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "poll_interval": self.poll_interval,
+        }
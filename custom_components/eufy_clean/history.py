@@ -0,0 +1,327 @@
+"""Append-only binary log of DPS changes and cleaning sessions."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO
+
+_LOGGER = logging.getLogger(__name__)
+
+# File layout, all fields big endian:
+#   magic (4) | version (1) | pad (3) | records
+# Record:
+#   kind (1) | payload length (2) | time (8, unix) | crc32 of payload (4)
+#   | payload
+# DPS payload:
+#   count (1) | count * (key length (1) | key | type (1) | value)
+#   with bool (1), int (8, signed) and str or JSON (length (2) | utf-8)
+# Session payload:
+#   start (8, unix) | battery at start (1, signed, -1 unknown)
+#   | battery at end (1, idem) | error count (1)
+#   | count * (length (1) | error code)
+# Times only grow, so a sparse index of every INDEX_STRIDE-th record
+# finds where a time range starts.
+FILE_HEADER = struct.Struct(">4sB3x")
+FILE_MAGIC = b"EUFH"
+FILE_VERSION = 1
+RECORD_HEADER = struct.Struct(">BHdI")
+SESSION_HEADER = struct.Struct(">dbbB")
+KIND_DPS = 1
+KIND_SESSION = 2
+VALUE_BOOL = 0
+VALUE_INT = 1
+VALUE_STR = 2
+VALUE_JSON = 3
+INDEX_STRIDE = 64
+MAX_PAYLOAD = 0xFFFF
+
+
+@dataclass(frozen=True)
+class Session:
+    """Summary of one cleaning run."""
+
+    start: float
+    end: float
+    battery_start: int | None
+    battery_end: int | None
+    errors: tuple[str, ...]
+
+    @property
+    def battery_used(self) -> int | None:
+        """Return the battery percentage the run used."""
+        if self.battery_start is None or self.battery_end is None:
+            return None
+        return self.battery_start - self.battery_end
+
+
+@dataclass
+class _OpenSession:
+    """A run that has not ended yet."""
+
+    start: float
+    battery: int | None
+    errors: list[str] = field(default_factory=list)
+
+
+class HistoryLog:
+    """Per-device log of DPS changes and cleaning sessions.
+
+    Records are buffered in memory and appended by ``flush``. Opening the
+    log scans it once to build the index: the summary of every session,
+    a few bytes each, and the offset of every ``INDEX_STRIDE``-th record.
+    Session queries never touch the file, and DPS queries read only the
+    records of the requested time range.
+
+    ``open``, ``flush`` and the queries are blocking; the rest runs in the
+    event loop.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the log."""
+        self.path = path
+        self.session: _OpenSession | None = None
+        self.sessions: list[Session] = []
+        self._pending: list[tuple[int, float, bytes]] = []
+        self._lock = threading.Lock()
+        self._index_times: list[float] = []
+        self._index_offsets: list[int] = []
+        self._records = 0
+        self._end = 0
+        self._last_time = 0.0
+
+    def open(self) -> None:
+        """Create the log or index the records it holds (blocking)."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a+b") as file:
+                file.seek(0)
+                if file.read(FILE_HEADER.size) != _file_header():
+                    if file.tell():
+                        _LOGGER.warning("Replacing unreadable history %s", self.path)
+                    file.truncate(0)
+                    file.write(_file_header())
+                    file.flush()
+            with self.path.open("r+b") as file, _mapped(file) as data:
+                end = FILE_HEADER.size
+                for kind, time, payload, offset, record_end in _records(data):
+                    self._index(kind, time, payload, offset)
+                    end = record_end
+                size = len(data)
+            if end < size:
+                _LOGGER.warning(
+                    "Dropping %s bytes of torn records from %s", size - end, self.path
+                )
+                with self.path.open("r+b") as file:
+                    file.truncate(end)
+            self._end = end
+
+    def record_dps(self, time: float, dps: dict[str, Any]) -> None:
+        """Buffer DPS changes."""
+        payload = _encode_dps(dps)
+        if len(payload) > MAX_PAYLOAD:
+            _LOGGER.debug("Not logging %s bytes of DPS changes", len(payload))
+            return
+        self._pending.append((KIND_DPS, time, payload))
+
+    def start_session(self, time: float, battery: int | None) -> None:
+        """Open a cleaning session."""
+        self.session = _OpenSession(time, battery)
+
+    def record_error(self, code: str) -> None:
+        """Note an error of the open session."""
+        if self.session is not None and code not in self.session.errors:
+            self.session.errors.append(code)
+
+    def end_session(self, time: float, battery: int | None) -> None:
+        """Close the open session and buffer its summary."""
+        if (session := self.session) is None:
+            return
+        self.session = None
+        errors = [code.encode()[:255] for code in session.errors[:255]]
+        payload = SESSION_HEADER.pack(
+            session.start,
+            -1 if session.battery is None else session.battery,
+            -1 if battery is None else battery,
+            len(errors),
+        ) + b"".join(bytes((len(code),)) + code for code in errors)
+        self._pending.append((KIND_SESSION, time, payload))
+
+    def flush(self) -> None:
+        """Append the buffered records (blocking)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            # Keep times ordered if the clock steps back
+            records = []
+            last_time = self._last_time
+            for kind, time, payload in pending:
+                last_time = max(time, last_time)
+                records.append((kind, last_time, payload))
+            chunks = [_record(*record) for record in records]
+            with self.path.open("ab") as file:
+                try:
+                    file.write(b"".join(chunks))
+                    file.flush()
+                except OSError:
+                    # Drop a torn tail so later records stay readable
+                    file.truncate(self._end)
+                    raise
+            for record, chunk in zip(records, chunks, strict=True):
+                self._index(*record, self._end)
+                self._end += len(chunk)
+
+    def query_sessions(
+        self, start: float | None = None, end: float | None = None
+    ) -> list[Session]:
+        """Return the sessions that started within a time range."""
+        with self._lock:
+            starts = [session.start for session in self.sessions]
+            first = 0 if start is None else bisect.bisect_left(starts, start)
+            last = len(starts) if end is None else bisect.bisect_right(starts, end)
+            return self.sessions[first:last]
+
+    def query_dps(
+        self, start: float | None = None, end: float | None = None, limit: int = 1000
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """Return the latest ``limit`` DPS changes within a time range (blocking)."""
+        with self._lock:
+            offset = FILE_HEADER.size
+            if start is not None:
+                position = bisect.bisect_left(self._index_times, start) - 1
+                if position >= 0:
+                    offset = self._index_offsets[position]
+            # Only the payloads that are returned get decoded
+            latest: deque[tuple[float, bytes]] = deque(maxlen=limit)
+            with self.path.open("rb") as file, _mapped(file) as data:
+                for kind, time, payload, _, _ in _records(data, offset, self._end):
+                    if end is not None and time > end:
+                        break
+                    if kind != KIND_DPS or (start is not None and time < start):
+                        continue
+                    latest.append((time, payload))
+            return [(time, _decode_dps(payload)) for time, payload in latest]
+
+    def _index(self, kind: int, time: float, payload: bytes, offset: int) -> None:
+        """Add a record to the in-memory index."""
+        if self._records % INDEX_STRIDE == 0:
+            self._index_times.append(time)
+            self._index_offsets.append(offset)
+        self._records += 1
+        self._last_time = time
+        if kind == KIND_SESSION:
+            self.sessions.append(_decode_session(time, payload))
+
+
+def _file_header() -> bytes:
+    """Return the header of a log file."""
+    return FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION)
+
+
+def _record(kind: int, time: float, payload: bytes) -> bytes:
+    """Return an encoded record."""
+    return RECORD_HEADER.pack(kind, len(payload), time, zlib.crc32(payload)) + payload
+
+
+@contextmanager
+def _mapped(file: BinaryIO) -> Iterator[bytes | mmap.mmap]:
+    """Map a file read-only; an empty file maps to no bytes."""
+    if not os.fstat(file.fileno()).st_size:
+        yield b""
+        return
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        yield mapping
+
+
+def _records(
+    data: bytes | mmap.mmap, offset: int = FILE_HEADER.size, end: int | None = None
+) -> Iterator[tuple[int, float, bytes, int, int]]:
+    """Yield kind, time, payload, offset and end of intact records."""
+    end = len(data) if end is None else min(end, len(data))
+    while offset + RECORD_HEADER.size <= end:
+        kind, size, time, crc = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        payload = bytes(data[start : start + size])
+        if len(payload) < size or zlib.crc32(payload) != crc:
+            return
+        yield kind, time, payload, offset, start + size
+        offset = start + size
+
+
+def _encode_dps(dps: dict[str, Any]) -> bytes:
+    """Return the payload of DPS changes.
+
+    Values too long for a record are left out.
+    """
+    pieces: list[bytes] = []
+    for key, value in dps.items():
+        if len(pieces) == 255:
+            break
+        if isinstance(value, bool):
+            encoded = struct.pack(">BB", VALUE_BOOL, value)
+        elif isinstance(value, int) and -(2**63) <= value < 2**63:
+            encoded = struct.pack(">Bq", VALUE_INT, value)
+        else:
+            kind = VALUE_STR if isinstance(value, str) else VALUE_JSON
+            text = (value if kind == VALUE_STR else json.dumps(value)).encode()
+            if len(text) > MAX_PAYLOAD:
+                _LOGGER.debug("Not logging %s bytes of DPS %s", len(text), key)
+                continue
+            encoded = struct.pack(">BH", kind, len(text)) + text
+        name = str(key).encode()[:255]
+        pieces.append(bytes((len(name),)) + name + encoded)
+    return bytes((len(pieces),)) + b"".join(pieces)
+
+
+def _decode_dps(payload: bytes) -> dict[str, Any]:
+    """Return the DPS changes of a payload."""
+    dps: dict[str, Any] = {}
+    offset = 1
+    for _ in range(payload[0]):
+        size = payload[offset]
+        key = payload[offset + 1 : offset + 1 + size].decode()
+        offset += 1 + size
+        kind = payload[offset]
+        offset += 1
+        if kind == VALUE_BOOL:
+            dps[key] = bool(payload[offset])
+            offset += 1
+        elif kind == VALUE_INT:
+            (dps[key],) = struct.unpack_from(">q", payload, offset)
+            offset += 8
+        else:
+            (size,) = struct.unpack_from(">H", payload, offset)
+            text = payload[offset + 2 : offset + 2 + size].decode()
+            dps[key] = text if kind == VALUE_STR else json.loads(text)
+            offset += 2 + size
+    return dps
+
+
+def _decode_session(end: float, payload: bytes) -> Session:
+    """Return the session summary of a payload."""
+    start, battery_start, battery_end, count = SESSION_HEADER.unpack_from(payload)
+    errors = []
+    offset = SESSION_HEADER.size
+    for _ in range(count):
+        size = payload[offset]
+        errors.append(payload[offset + 1 : offset + 1 + size].decode())
+        offset += 1 + size
+    return Session(
+        start=start,
+        end=end,
+        battery_start=None if battery_start < 0 else battery_start,
+        battery_end=None if battery_end < 0 else battery_end,
+        errors=tuple(errors),
+    )
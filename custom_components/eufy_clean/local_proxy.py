@@ -0,0 +1,211 @@
+"""Local Tuya endpoint sharing the integration's device session."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, cast
+
+from .const import DEFAULT_PROXY_HOST, TUYA_VERSION
+from .eufy_api import EufyCleanAPI
+from .executor import DeviceIOExecutor
+from .tuya_crypto import (
+    decrypt_local_payload,
+    encrypt_local_payload,
+    get_local_key_cipher,
+)
+from .tuya_frame import TuyaFrameParser, pack_frame
+
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.ciphers import Cipher
+
+_LOGGER = logging.getLogger(__name__)
+
+# Tuya command codes handled by the proxy
+CONTROL = 7
+STATUS = 8
+HEART_BEAT = 9
+DP_QUERY = 10
+CONTROL_NEW = 13
+DP_QUERY_NEW = 16
+UPDATEDPS = 18
+
+# Pushes and control frames carry the protocol version and 12 padding bytes
+VERSION_HEADER = TUYA_VERSION.encode() + bytes(12)
+# Clients that stop reading are dropped instead of buffering pushes for them
+MAX_CLIENT_BUFFER = 64 * 1024
+
+
+class LocalProxy:
+    """Protocol 3.3 endpoint multiplexing local clients over one session.
+
+    Clients talk to the proxy as they would to the robot, encrypting with its
+    local key. Status queries are answered from the integration's shared
+    status request, writes go through the API's command path one at a time,
+    and every DPS change the integration sees is pushed to all connected
+    clients. Protocol 3.4 clients are not supported: they need a per-session
+    key negotiation the proxy does not implement.
+    """
+
+    def __init__(
+        self, api: EufyCleanAPI, port: int, host: str = DEFAULT_PROXY_HOST
+    ) -> None:
+        """Initialize the proxy."""
+        self.api = api
+        self.host = host
+        self.port = port
+        self._clients: set[_ProxyClient] = set()
+        self._server: asyncio.Server | None = None
+        self._cipher: Cipher | None = None
+        self._seqno = itertools.count(1)
+        self._remove_listener: Callable[[], None] | None = None
+
+    async def async_start(self, executor: DeviceIOExecutor) -> None:
+        """Start listening for clients."""
+        # Imports cryptography, so keep it off the event loop
+        self._cipher = await executor.async_run(
+            get_local_key_cipher, self.api.local_key
+        )
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: _ProxyClient(self), self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._remove_listener = self.api.async_add_dps_listener(self._broadcast)
+        _LOGGER.info(
+            "Local proxy for %s listening on port %s", self.api.device_id, self.port
+        )
+
+    def close(self) -> None:
+        """Stop the proxy and disconnect its clients."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for client in tuple(self._clients):
+            client.close()
+
+    def _broadcast(self, dps: dict[str, Any]) -> None:
+        """Push changed DPS to every client."""
+        if not self._clients:
+            return
+        payload = self._encrypt({"dps": dps}, header=True)
+        seqno = next(self._seqno)
+        for client in tuple(self._clients):
+            client.send(seqno, STATUS, payload)
+
+    def _encrypt(self, message: dict[str, Any], header: bool = False) -> bytes:
+        """Encrypt a JSON message for a client."""
+        if self._cipher is None:
+            raise RuntimeError("The proxy is not started")
+        data = encrypt_local_payload(
+            self._cipher, json.dumps(message, separators=(",", ":")).encode()
+        )
+        return VERSION_HEADER + data if header else data
+
+    def _decrypt(self, payload: bytes) -> dict[str, Any]:
+        """Decrypt a JSON object from a client, or raise ValueError."""
+        if payload.startswith(VERSION_HEADER[:3]):
+            payload = payload[len(VERSION_HEADER) :]
+        if self._cipher is None:
+            raise RuntimeError("The proxy is not started")
+        message = json.loads(decrypt_local_payload(self._cipher, payload))
+        if not isinstance(message, dict):
+            raise ValueError(f"Expected a JSON object, got {type(message).__name__}")
+        return message
+
+    async def async_handle(
+        self, client: _ProxyClient, seqno: int, cmd: int, payload: bytes
+    ) -> None:
+        """Answer one request of a client."""
+        if cmd == HEART_BEAT:
+            client.send(seqno, cmd, b"")
+        elif cmd in (DP_QUERY, DP_QUERY_NEW):
+            await self.api.async_get_status()
+            message = {"devId": self.api.device_id, "dps": self.api.dps}
+            client.send(seqno, cmd, self._encrypt(message))
+        elif cmd == UPDATEDPS:
+            client.send(seqno, cmd, b"")
+            # Changed values reach the client through the DPS listener
+            await self.api.async_get_status()
+        elif cmd in (CONTROL, CONTROL_NEW):
+            try:
+                dps = self._decrypt(payload).get("dps") or {}
+                if not isinstance(dps, dict):
+                    raise ValueError(f"Expected DPS values, got {dps!r}")
+                delivered = await self.api.async_send_dps(dps)
+            except ValueError as err:
+                _LOGGER.debug("Rejected proxy write: %s", err)
+                delivered = False
+            client.send(seqno, cmd, b"", retcode=0 if delivered else 1)
+            if delivered:
+                await self.api.async_get_status()
+        else:
+            _LOGGER.debug("Ignoring unsupported command %s from proxy client", cmd)
+            client.send(seqno, cmd, b"", retcode=1)
+
+
+class _ProxyClient(asyncio.BufferedProtocol):
+    """Connection of one local client to the proxy."""
+
+    def __init__(self, proxy: LocalProxy) -> None:
+        """Initialize the connection."""
+        self.proxy = proxy
+        self.transport: asyncio.Transport | None = None
+        # Requests of a client are answered in order
+        self._lock = asyncio.Lock()
+        self._parser = TuyaFrameParser(has_retcode=False)
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Register the client as a subscriber."""
+        # Stream servers always hand over a full transport
+        self.transport = cast(asyncio.Transport, transport)
+        self.proxy._clients.add(self)
+        _LOGGER.debug("Proxy client %s connected", transport.get_extra_info("peername"))
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Unregister the client."""
+        self.proxy._clients.discard(self)
+        self.transport = None
+        for task in self._tasks:
+            task.cancel()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """Return the parser buffer to receive into."""
+        return self._parser.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Handle every complete frame received."""
+        self._parser.buffer_updated(nbytes)
+        for frame in self._parser:
+            task = asyncio.create_task(
+                self._async_handle(frame.seqno, frame.cmd, bytes(frame.payload))
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _async_handle(self, seqno: int, cmd: int, payload: bytes) -> None:
+        """Handle one request after the ones received before it."""
+        async with self._lock:
+            await self.proxy.async_handle(self, seqno, cmd, payload)
+
+    def send(self, seqno: int, cmd: int, payload: bytes, retcode: int = 0) -> None:
+        """Send a frame unless the client stopped reading."""
+        if self.transport is None or self.transport.is_closing():
+            return
+        if self.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            _LOGGER.debug("Dropping proxy client that stopped reading")
+            self.close()
+            return
+        self.transport.write(pack_frame(seqno, cmd, payload, retcode=retcode))
+
+    def close(self) -> None:
+        """Disconnect the client."""
+        if self.transport is not None:
+            self.transport.close()
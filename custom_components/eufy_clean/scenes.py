@@ -0,0 +1,128 @@
+"""Cleaning scenes of X10/S1-class robots, cached from the cloud."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import SCENE_TTL, STORAGE_KEY_SCENES, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Scene(NamedTuple):
+    """A cleaning scene, started by writing its id to the scene DPS."""
+
+    id: int
+    name: str
+
+
+def parse_scenes(raw: Any) -> tuple[Scene, ...]:
+    """Return the scenes of a cloud scene list, in cloud order.
+
+    The list may come wrapped as ``{"list": [...]}``. Entries that are not
+    objects or have no numeric id are skipped; unnamed scenes are named
+    after their id.
+    """
+    if isinstance(raw, dict):
+        raw = raw.get("list")
+    if not isinstance(raw, list):
+        _LOGGER.debug("Ignoring scene list of unknown shape: %s", raw)
+        return ()
+    scenes: dict[int, Scene] = {}
+    for entry in raw:
+        if not isinstance(entry, dict):
+            _LOGGER.debug("Skipping scene entry: %s", entry)
+            continue
+        if (raw_id := entry.get("id", entry.get("sceneId"))) is None:
+            _LOGGER.debug("Skipping scene without id: %s", entry)
+            continue
+        try:
+            scene_id = int(raw_id)
+        except (TypeError, ValueError):
+            _LOGGER.debug("Skipping scene with id %s: %s", raw_id, entry)
+            continue
+        name = str(entry.get("name") or entry.get("sceneName") or "").strip()
+        scenes.setdefault(scene_id, Scene(scene_id, name or f"Scene {scene_id}"))
+    return tuple(scenes.values())
+
+
+def scene_etag(scenes: Iterable[Scene]) -> str:
+    """Return a tag that changes whenever the scene list does."""
+    payload = json.dumps([list(scene) for scene in scenes], separators=(",", ":"))
+    return hashlib.sha1(payload.encode(), usedforsecurity=False).hexdigest()
+
+
+class SceneCatalogue:
+    """Scenes of one robot, kept in storage with a tag and fetch time.
+
+    The cloud is only asked during setup and when the user refreshes the
+    list from the options; starting a scene reads the catalogue in memory.
+    """
+
+    def __init__(self, hass: HomeAssistant, device_id: str) -> None:
+        """Initialize an empty catalogue."""
+        self.scenes: tuple[Scene, ...] = ()
+        self.etag: str | None = None
+        self.fetched_at: float | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY_SCENES}.{device_id}"
+        )
+
+    @property
+    def expired(self) -> bool:
+        """Return True if the scenes were never fetched or are out of date."""
+        return self.fetched_at is None or time.time() - self.fetched_at > SCENE_TTL
+
+    @property
+    def labels(self) -> dict[str, Scene]:
+        """Return the scenes by label, names made unique with their id."""
+        names = [scene.name for scene in self.scenes]
+        return {
+            scene.name
+            if names.count(scene.name) == 1
+            else f"{scene.name} ({scene.id})": scene
+            for scene in self.scenes
+        }
+
+    def find(self, value: str | int) -> Scene | None:
+        """Return the scene with a label, name or id."""
+        labels = self.labels
+        if (scene := labels.get(str(value))) is not None:
+            return scene
+        for scene in self.scenes:
+            if scene.name == value or str(scene.id) == str(value):
+                return scene
+        return None
+
+    async def async_load(self) -> None:
+        """Load the scenes saved by the last fetch."""
+        if not (stored := await self._store.async_load()):
+            return
+        self.scenes = tuple(Scene(*scene) for scene in stored["scenes"])
+        self.etag = stored["etag"]
+        self.fetched_at = stored["fetched_at"]
+
+    async def async_update(self, scenes: Iterable[Scene]) -> bool:
+        """Save freshly fetched scenes and return True if they changed."""
+        scenes = tuple(scenes)
+        etag = scene_etag(scenes)
+        changed = etag != self.etag
+        self.scenes = scenes
+        self.etag = etag
+        self.fetched_at = time.time()
+        await self._store.async_save(
+            {
+                "scenes": [list(scene) for scene in scenes],
+                "etag": etag,
+                "fetched_at": self.fetched_at,
+            }
+        )
+        return changed
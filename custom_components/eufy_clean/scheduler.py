@@ -0,0 +1,166 @@
+"""Per-device request scheduler giving commands priority over status polls."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+
+class RequestDroppedError(Exception):
+    """Raised to a poll that was dropped in favour of a command."""
+
+
+@dataclass(order=True)
+class _Request:
+    """A queued blocking call to the device."""
+
+    priority: int
+    seqno: int
+    func: Callable[..., Any] = field(compare=False)
+    args: tuple[Any, ...] = field(compare=False)
+    future: asyncio.Future[Any] = field(compare=False)
+    interrupted: bool = field(default=False, compare=False)
+
+
+class DeviceRequestScheduler:
+    """Run blocking calls on one device connection, one at a time.
+
+    Commands run before queued polls (FIFO among themselves). Queuing a
+    command drops every queued poll, and polls submitted while a command is
+    pending are dropped straight away: the device answers with fresh state
+    after the command anyway. A poll that is in flight when a command arrives
+    is interrupted through ``interrupt`` so the command does not have to wait
+    for a full socket timeout.
+    """
+
+    def __init__(
+        self,
+        run: Callable[..., Awaitable[Any]],
+        interrupt: Callable[[], None],
+    ) -> None:
+        """Initialize the scheduler.
+
+        ``run(func, *args, sheddable=...)`` executes a blocking call, and
+        ``interrupt()`` aborts the blocking call currently in flight.
+        """
+        self._run = run
+        self._interrupt = interrupt
+        self._queue: list[_Request] = []
+        self._active: _Request | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._seqno = itertools.count()
+
+    @property
+    def command_pending(self) -> bool:
+        """Return True if a command is queued or in flight."""
+        return any(
+            request.priority == PRIORITY_COMMAND
+            for request in (*self._queue, self._active)
+            if request is not None
+        )
+
+    async def async_command(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a command ahead of any queued poll."""
+        return await self._async_submit(PRIORITY_COMMAND, func, args)
+
+    async def async_poll(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a status poll unless a command is pending."""
+        if self.command_pending:
+            raise RequestDroppedError("Command pending")
+        return await self._async_submit(PRIORITY_POLL, func, args)
+
+    async def _async_submit(
+        self, priority: int, func: Callable[..., Any], args: tuple[Any, ...]
+    ) -> Any:
+        """Queue a request and wait for its result."""
+        request = _Request(
+            priority,
+            next(self._seqno),
+            func,
+            args,
+            asyncio.get_running_loop().create_future(),
+        )
+
+        if priority == PRIORITY_COMMAND:
+            self._drop_polls()
+        heapq.heappush(self._queue, request)
+        self._start_next()
+
+        try:
+            return await request.future
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. its deadline expired)
+            if request in self._queue:
+                self._queue.remove(request)
+                heapq.heapify(self._queue)
+            elif request is self._active and priority == PRIORITY_POLL:
+                self._interrupt_active()
+            raise
+
+    def _drop_polls(self) -> None:
+        """Drop queued polls and interrupt the one in flight."""
+        dropped = [r for r in self._queue if r.priority == PRIORITY_POLL]
+        if dropped:
+            self._queue = [r for r in self._queue if r.priority != PRIORITY_POLL]
+            heapq.heapify(self._queue)
+        for request in dropped:
+            if not request.future.done():
+                request.future.set_exception(RequestDroppedError("Command queued"))
+
+        if self._active is not None and self._active.priority == PRIORITY_POLL:
+            self._interrupt_active()
+
+    def _interrupt_active(self) -> None:
+        """Abort the poll in flight and release its caller."""
+        request = self._active
+        if request is None or request.interrupted:
+            return
+        request.interrupted = True
+        _LOGGER.debug("Interrupting in-flight status poll")
+        try:
+            self._interrupt()
+        except Exception as err:
+            _LOGGER.debug("Failed to interrupt status poll: %s", err)
+        if not request.future.done():
+            request.future.set_exception(RequestDroppedError("Poll interrupted"))
+
+    def _start_next(self) -> None:
+        """Start the next queued request if the connection is idle."""
+        if self._active is not None or not self._queue:
+            return
+        self._active = heapq.heappop(self._queue)
+        self._task = asyncio.get_running_loop().create_task(
+            self._async_execute(self._active)
+        )
+
+    async def _async_execute(self, request: _Request) -> None:
+        """Run one request and start the next one."""
+        try:
+            result = await self._run(
+                request.func,
+                *request.args,
+                sheddable=request.priority == PRIORITY_POLL,
+            )
+        except asyncio.CancelledError:
+            request.future.cancel()
+            raise
+        except Exception as err:
+            if not request.future.done():
+                request.future.set_exception(err)
+        else:
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            self._active = None
+            self._task = None
+            self._start_next()
@@ -0,0 +1,66 @@
+"""Select platform starting the cleaning scenes of a Eufy Clean vacuum."""
+
+from __future__ import annotations
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import CONF_DEVICE_ID, CONF_MODEL, DOMAIN
+from .coordinator import EufyCleanDataUpdateCoordinator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the scene select of a vacuum with cleaning scenes."""
+    coordinator: EufyCleanDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if coordinator.api.profile.scene_dps is None or not coordinator.scenes.scenes:
+        return
+
+    async_add_entities([EufyCleanSceneSelect(coordinator, entry)])
+
+
+class EufyCleanSceneSelect(
+    CoordinatorEntity[EufyCleanDataUpdateCoordinator], SelectEntity
+):
+    """Cleaning scene of a Eufy Clean vacuum; selecting one starts it."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "scene"
+
+    def __init__(
+        self,
+        coordinator: EufyCleanDataUpdateCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the select."""
+        super().__init__(coordinator)
+
+        self._attr_unique_id = f"{entry.data[CONF_DEVICE_ID]}_scene"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.data[CONF_DEVICE_ID])},
+            "name": entry.title,
+            "manufacturer": "Eufy",
+            "model": entry.data.get(CONF_MODEL, "RoboVac"),
+        }
+        self._attr_options = list(coordinator.scenes.labels)
+        self._attr_current_option = None
+
+    async def async_select_option(self, option: str) -> None:
+        """Start the scene, with one local DPS write."""
+        if (scene := self.coordinator.scenes.labels.get(option)) is None:
+            raise ServiceValidationError(f"Unknown scene {option}")
+
+        if not await self.coordinator.api.async_clean_scene(scene.id):
+            raise HomeAssistantError(
+                f"Scene {option} on {self.coordinator.api.device_ip} failed"
+            )
+        self._attr_current_option = option
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
@@ -0,0 +1,298 @@
+"""Services for the Eufy Clean integration."""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_COMMAND,
+    ATTR_DPS,
+    ATTR_END,
+    ATTR_INCLUDE_DPS,
+    ATTR_LIMIT,
+    ATTR_PARALLELISM,
+    ATTR_RETRIES,
+    ATTR_SCENE,
+    ATTR_STAGGER,
+    ATTR_START,
+    COMMAND_SET_DPS,
+    DEFAULT_FLEET_PARALLELISM,
+    DEFAULT_FLEET_RETRIES,
+    DEFAULT_FLEET_STAGGER,
+    DEFAULT_HISTORY_LIMIT,
+    DOMAIN,
+    FLEET_COMMANDS,
+    SERVICE_FLEET_COMMAND,
+    SERVICE_GET_HISTORY,
+    SERVICE_SCENE_CLEAN,
+    SERVICE_SEND_DPS,
+)
+from .coordinator import EufyCleanDataUpdateCoordinator
+from .fleet import DispatchResult, async_dispatch, summarize
+from .history import HistoryLog, Session
+
+DPS_SCHEMA = vol.All(
+    vol.Schema({cv.string: vol.Any(bool, int, str)}), vol.Length(min=1)
+)
+
+SEND_DPS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_DPS): DPS_SCHEMA,
+    }
+)
+
+FLEET_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_COMMAND): vol.In(FLEET_COMMANDS),
+        vol.Optional(ATTR_DPS): DPS_SCHEMA,
+        vol.Optional(ATTR_PARALLELISM, default=DEFAULT_FLEET_PARALLELISM): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=32)
+        ),
+        vol.Optional(ATTR_STAGGER, default=DEFAULT_FLEET_STAGGER): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=60)
+        ),
+        vol.Optional(ATTR_RETRIES, default=DEFAULT_FLEET_RETRIES): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=5)
+        ),
+    }
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_INCLUDE_DPS, default=False): cv.boolean,
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_HISTORY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+    }
+)
+
+SCENE_CLEAN_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_SCENE): cv.string,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_send_dps(call: ServiceCall) -> ServiceResponse:
+        """Write raw DPS values to every target vacuum at once."""
+        coordinators = _async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+        results = await async_dispatch(
+            {
+                entity_id: functools.partial(
+                    coordinator.api.async_send_dps, call.data[ATTR_DPS]
+                )
+                for entity_id, coordinator in coordinators.items()
+            },
+            parallelism=len(coordinators),
+            stagger=0,
+            retries=0,
+        )
+        await _async_refresh(coordinators, results)
+        return {entity_id: result.as_dict() for entity_id, result in results.items()}
+
+    async def async_fleet_command(call: ServiceCall) -> ServiceResponse:
+        """Send one command to many vacuums with bounded, staggered dispatch."""
+        command = call.data[ATTR_COMMAND]
+        if command == COMMAND_SET_DPS and ATTR_DPS not in call.data:
+            raise ServiceValidationError(f"{COMMAND_SET_DPS} needs {ATTR_DPS}")
+        if command != COMMAND_SET_DPS and ATTR_DPS in call.data:
+            raise ServiceValidationError(f"{command} takes no {ATTR_DPS}")
+
+        coordinators = _async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+        results = await async_dispatch(
+            {
+                entity_id: _fleet_job(coordinator, command, call.data.get(ATTR_DPS))
+                for entity_id, coordinator in coordinators.items()
+            },
+            parallelism=call.data[ATTR_PARALLELISM],
+            stagger=call.data[ATTR_STAGGER],
+            retries=call.data[ATTR_RETRIES],
+        )
+        await _async_refresh(coordinators, results)
+        return summarize(results)
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return the cleaning sessions and DPS changes of every target vacuum."""
+        coordinators = _async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+        start = _timestamp(call.data.get(ATTR_START))
+        end = _timestamp(call.data.get(ATTR_END))
+        response: dict[str, Any] = {}
+        for entity_id, coordinator in coordinators.items():
+            await coordinator.async_flush_history()
+            response[entity_id] = await hass.async_add_executor_job(
+                _query_history,
+                coordinator.history,
+                start,
+                end,
+                call.data[ATTR_INCLUDE_DPS],
+                call.data[ATTR_LIMIT],
+            )
+        return response
+
+    async def async_scene_clean(call: ServiceCall) -> ServiceResponse:
+        """Start a cleaning scene, by name or id, on every target vacuum."""
+        coordinators = _async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+        jobs: dict[str, Callable[[], Awaitable[bool]]] = {}
+        for entity_id, coordinator in coordinators.items():
+            if coordinator.api.profile.scene_dps is None:
+                raise ServiceValidationError(
+                    f"{coordinator.api.profile.name} devices do not clean scenes"
+                )
+            if (scene := coordinator.scenes.find(call.data[ATTR_SCENE])) is None:
+                raise ServiceValidationError(
+                    f"{entity_id} has no scene {call.data[ATTR_SCENE]}"
+                )
+            jobs[entity_id] = functools.partial(
+                coordinator.api.async_clean_scene, scene.id
+            )
+        results = await async_dispatch(
+            jobs, parallelism=len(jobs), stagger=0, retries=0
+        )
+        await _async_refresh(coordinators, results)
+        return {entity_id: result.as_dict() for entity_id, result in results.items()}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_DPS,
+        async_send_dps,
+        schema=SEND_DPS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FLEET_COMMAND,
+        async_fleet_command,
+        schema=FLEET_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SCENE_CLEAN,
+        async_scene_clean,
+        schema=SCENE_CLEAN_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_get_coordinators(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> dict[str, EufyCleanDataUpdateCoordinator]:
+    """Return the coordinator behind each Eufy Clean entity."""
+    registry = er.async_get(hass)
+    coordinators: dict[str, EufyCleanDataUpdateCoordinator] = {}
+    for entity_id in entity_ids:
+        entity = registry.async_get(entity_id)
+        coordinator = (
+            hass.data.get(DOMAIN, {}).get(entity.config_entry_id)
+            if entity is not None and entity.platform == DOMAIN
+            else None
+        )
+        if coordinator is None:
+            raise ServiceValidationError(
+                f"{entity_id} is not a loaded Eufy Clean vacuum"
+            )
+        coordinators[entity_id] = coordinator
+    return coordinators
+
+
+def _fleet_job(
+    coordinator: EufyCleanDataUpdateCoordinator,
+    command: str,
+    dps: dict[str, Any] | None,
+) -> Callable[[], Awaitable[bool]]:
+    """Return the API call running a fleet command on one vacuum."""
+    api = coordinator.api
+    # The handler only passes DPS values along with the set_dps command
+    if dps is not None:
+        return functools.partial(api.async_send_dps, dps)
+    return getattr(api, f"async_{command}")
+
+
+async def _async_refresh(
+    coordinators: dict[str, EufyCleanDataUpdateCoordinator],
+    results: dict[str, DispatchResult],
+) -> None:
+    """Refresh the vacuums a command was delivered to."""
+    for entity_id, coordinator in coordinators.items():
+        if results[entity_id].success:
+            await coordinator.async_request_refresh()
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    """Return the Unix time of a service datetime, local time if naive."""
+    if value is None:
+        return None
+    return dt_util.as_utc(value).timestamp()
+
+
+def _query_history(
+    history: HistoryLog,
+    start: float | None,
+    end: float | None,
+    include_dps: bool,
+    limit: int,
+) -> dict[str, Any]:
+    """Return the latest sessions and DPS changes of a log (blocking)."""
+    result: dict[str, Any] = {
+        "sessions": [
+            _session_as_dict(session)
+            for session in history.query_sessions(start, end)[-limit:]
+        ]
+    }
+    if include_dps:
+        result["dps"] = [
+            {"time": _isoformat(time), "dps": dps}
+            for time, dps in history.query_dps(start, end, limit)
+        ]
+    return result
+
+
+def _session_as_dict(session: Session) -> dict[str, Any]:
+    """Return a session summary for a service response."""
+    return {
+        "start": _isoformat(session.start),
+        "end": _isoformat(session.end),
+        "duration": round(session.end - session.start),
+        "errors": list(session.errors),
+        "battery_used": session.battery_used,
+    }
+
+
+def _isoformat(timestamp: float) -> str:
+    """Return a Unix time as an ISO 8601 UTC string."""
+    return dt_util.utc_from_timestamp(timestamp).isoformat()
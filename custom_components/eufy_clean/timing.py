@@ -0,0 +1,72 @@
+"""Round trip time tracking and adaptive socket timeouts."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any
+
+from .const import (
+    MAX_SOCKET_TIMEOUT,
+    MIN_SOCKET_TIMEOUT,
+    RTT_MIN_SAMPLES,
+    RTT_TIMEOUT_MULTIPLIER,
+    RTT_WINDOW,
+)
+
+
+class RttEstimator:
+    """Track the round trip times of one device.
+
+    The socket timeout is the p99 of the recent samples times a multiplier,
+    clamped to ``[min_timeout, max_timeout]``. Until enough samples exist the
+    maximum is used, so a slow first answer is not cut off.
+    """
+
+    def __init__(
+        self,
+        window: int = RTT_WINDOW,
+        multiplier: float = RTT_TIMEOUT_MULTIPLIER,
+        min_timeout: float = MIN_SOCKET_TIMEOUT,
+        max_timeout: float = MAX_SOCKET_TIMEOUT,
+    ) -> None:
+        """Initialize the estimator."""
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._samples: deque[float] = deque(maxlen=window)
+        # Samples are added from executor threads
+        self._lock = threading.Lock()
+
+    def add_sample(self, rtt: float) -> None:
+        """Record the duration of a successful request in seconds."""
+        with self._lock:
+            self._samples.append(rtt)
+
+    def percentile(self, quantile: float) -> float | None:
+        """Return the given quantile (0-1) of the recent samples."""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        return ordered[index]
+
+    @property
+    def timeout(self) -> float:
+        """Return the socket timeout to use for the next request."""
+        if len(self._samples) < RTT_MIN_SAMPLES:
+            return self.max_timeout
+        p99 = self.percentile(0.99) or self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.multiplier))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current statistics for diagnostics."""
+        p50 = self.percentile(0.5)
+        p99 = self.percentile(0.99)
+        return {
+            "samples": len(self._samples),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+            "timeout_s": round(self.timeout, 2),
+        }
@@ -18,6 +18,7 @@ from urllib.parse import urljoin
 import aiohttp
 
 from .const import (
+    DEFAULT_TIMEOUT,
     TUYA_API_BASE,
     TUYA_CLIENT_ID,
     TUYA_HMAC_KEY,
@@ -167,7 +168,11 @@ class TuyaAPIClient:
             headers = {"User-Agent": "TY-UA=APP/Android/2.4.0/SDK/null"}
 
             async with self.session.post(
-                url, params=params, data=form_data, headers=headers, timeout=10
+                url,
+                params=params,
+                data=form_data,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
             ) as response:
                 response.raise_for_status()
                 result = await response.json()
@@ -243,8 +248,11 @@ class TuyaAPIClient:
                 f"Missing token data from Tuya API. Got: {token_response.keys()}"
             )
 
-        # Determine password (MD5-hashed AES-encrypted username)
-        password = self._determine_password(self.username)
+        # Determine password (MD5-hashed AES-encrypted username); runs in the
+        # executor because the first call imports cryptography
+        password = await asyncio.get_event_loop().run_in_executor(
+            None, self._determine_password, self.username
+        )
 
         # Encrypt password with RSA using public key from token response
         encrypted_password = await asyncio.get_event_loop().run_in_executor(
@@ -307,6 +315,20 @@ class TuyaAPIClient:
 
         return all_devices
 
+    async def list_scenes(self, device_id: str) -> Any:
+        """List the cleaning scenes (rooms and routines) of a device.
+
+        The action is not documented by Tuya and answers may differ between
+        models, a list or an object wrapping one, so callers parse the
+        answer defensively.
+        """
+        result = await self._request(
+            action="tuya.m.device.scene.list",
+            version="1.0",
+            query_params={"devId": device_id},
+        )
+        return result or []
+
     async def get_all_devices(self) -> list[dict[str, Any]]:
         """Get all devices from all homes."""
         homes = await self.list_homes()
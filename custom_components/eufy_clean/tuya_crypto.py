@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import math
 from hashlib import md5
+from typing import TYPE_CHECKING
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.ciphers import Cipher
 
 # Tuya password encryption keys (from Eufy Home Android app)
 TUYA_PASSWORD_KEY = bytearray(
@@ -42,9 +43,45 @@ def shuffled_md5(value: str) -> str:
 
 
 def get_tuya_password_cipher() -> Cipher:
-    """Get the Tuya password cipher for AES encryption."""
+    """Get the Tuya password cipher for AES encryption.
+
+    cryptography is only needed during config flows, so it is imported on
+    first use instead of when the integration is loaded.
+    """
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
     return Cipher(
         algorithms.AES(bytes(TUYA_PASSWORD_KEY)),
         modes.CBC(bytes(TUYA_PASSWORD_IV)),
         backend=default_backend(),
     )
+
+
+def get_local_key_cipher(local_key: str) -> Cipher:
+    """Get the AES-ECB cipher protecting local protocol 3.3 payloads."""
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    return Cipher(algorithms.AES(local_key.encode("latin1")), modes.ECB())
+
+
+def encrypt_local_payload(cipher: Cipher, data: bytes) -> bytes:
+    """Encrypt a local payload with PKCS#7 padding."""
+    pad = 16 - len(data) % 16
+    encryptor = cipher.encryptor()
+    return encryptor.update(data + bytes([pad]) * pad) + encryptor.finalize()
+
+
+def decrypt_local_payload(cipher: Cipher, data: bytes) -> bytes:
+    """Decrypt a local payload and strip its PKCS#7 padding.
+
+    Raises ValueError if the payload was not encrypted with this key.
+    """
+    if not data or len(data) % 16:
+        raise ValueError("Payload is not a whole number of AES blocks")
+    decryptor = cipher.decryptor()
+    plain = decryptor.update(data) + decryptor.finalize()
+    pad = plain[-1]
+    if not 1 <= pad <= 16 or plain[-pad:] != bytes([pad]) * pad:
+        raise ValueError("Invalid padding, wrong local key?")
+    return plain[:-pad]
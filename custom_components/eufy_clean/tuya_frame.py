@@ -0,0 +1,208 @@
+"""Incremental parser for Tuya 55AA frames received on the local socket."""
+
+from __future__ import annotations
+
+import hmac
+import struct
+import zlib
+from collections.abc import Iterator
+from hashlib import sha256
+from typing import NamedTuple
+
+# Frame layout (protocol 3.1 - 3.4):
+#   prefix (4) | seqno (4) | cmd (4) | length (4) | [retcode (4)] | payload
+#   | crc32 (4) or hmac-sha256 (32) | suffix (4)
+# ``length`` counts everything after the length field, including the trailer.
+PREFIX_55AA: bytes = b"\x00\x00\x55\xaa"
+SUFFIX_55AA: bytes = b"\x00\x00\xaa\x55"
+HEADER = struct.Struct(">4I")
+RETCODE = struct.Struct(">I")
+CRC_TRAILER_LEN = 8
+HMAC_TRAILER_LEN = 36
+
+# Large enough for the map DPS of L/X-series robots, small enough to reject
+# garbage length fields before buffering them.
+MAX_FRAME_SIZE = 256 * 1024
+DEFAULT_BUFFER_SIZE = 4096
+
+
+class TuyaFrame(NamedTuple):
+    """A validated Tuya frame.
+
+    ``payload`` is a view into the parser's buffer and is only valid until the
+    next call to ``feed``/``get_buffer``. Copy it with ``bytes()`` if it has to
+    outlive the current iteration.
+    """
+
+    seqno: int
+    cmd: int
+    retcode: int | None
+    payload: memoryview
+
+
+def pack_frame(
+    seqno: int,
+    cmd: int,
+    payload: bytes,
+    retcode: int | None = None,
+    hmac_key: bytes | None = None,
+) -> bytes:
+    """Build a 55AA frame (used by tests, benchmarks and the local proxy)."""
+    body = payload if retcode is None else RETCODE.pack(retcode) + payload
+    trailer_len = HMAC_TRAILER_LEN if hmac_key else CRC_TRAILER_LEN
+    header = HEADER.pack(
+        int.from_bytes(PREFIX_55AA, "big"), seqno, cmd, len(body) + trailer_len
+    )
+    data = header + body
+    if hmac_key:
+        checksum = hmac.new(hmac_key, data, sha256).digest()
+    else:
+        checksum = struct.pack(">I", zlib.crc32(data) & 0xFFFFFFFF)
+    return data + checksum + SUFFIX_55AA
+
+
+class TuyaFrameParser:
+    """Zero-copy parser for a stream of 55AA frames.
+
+    Bytes are written into a reusable ``bytearray`` either through ``feed`` or,
+    without any intermediate copy, through ``get_buffer``/``buffer_updated``
+    (the ``asyncio.BufferedProtocol`` / ``socket.recv_into`` contract). Partial
+    frames stay in the buffer until the rest arrives, coalesced frames are
+    split, and frames with a bad length, suffix or checksum are dropped before
+    anyone tries to decrypt them.
+    """
+
+    def __init__(
+        self,
+        hmac_key: bytes | None = None,
+        has_retcode: bool = True,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_frame_size: int = MAX_FRAME_SIZE,
+    ) -> None:
+        """Initialize the parser.
+
+        ``hmac_key`` switches the trailer from CRC32 (3.3) to HMAC-SHA256
+        (3.4). ``has_retcode`` is True for frames sent by the device.
+        """
+        self.hmac_key = hmac_key
+        self.has_retcode = has_retcode
+        self.max_frame_size = max_frame_size
+        self._buf = bytearray(buffer_size)
+        self._start = 0
+        self._end = 0
+        self.frames_parsed = 0
+        self.frames_dropped = 0
+        self.bytes_discarded = 0
+
+    @property
+    def buffered(self) -> int:
+        """Return the number of bytes waiting for the rest of their frame."""
+        return self._end - self._start
+
+    def reset(self) -> None:
+        """Discard buffered data, e.g. after the socket was reconnected."""
+        self._start = self._end = 0
+
+    def get_buffer(self, sizehint: int = -1) -> memoryview:
+        """Return a writable view of the free space at the end of the buffer."""
+        needed = max(sizehint, DEFAULT_BUFFER_SIZE // 4)
+        if len(self._buf) - self._end < needed:
+            self._make_room(needed)
+        return memoryview(self._buf)[self._end :]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Commit ``nbytes`` written into the view returned by ``get_buffer``."""
+        self._end += nbytes
+
+    def feed(self, data: bytes | bytearray | memoryview) -> None:
+        """Append received bytes to the buffer."""
+        size = len(data)
+        with self.get_buffer(size) as view:
+            view[:size] = data
+        self.buffer_updated(size)
+
+    def _make_room(self, needed: int) -> None:
+        """Move the pending partial frame to the front, growing if required."""
+        pending = self._end - self._start
+        if pending + needed > len(self._buf):
+            # Allocate instead of resizing in place: views handed out for the
+            # previous batch of frames keep pointing at the old buffer.
+            size = len(self._buf)
+            while size < pending + needed:
+                size *= 2
+            new_buf = bytearray(size)
+            new_buf[:pending] = self._buf[self._start : self._end]
+            self._buf = new_buf
+        elif pending:
+            self._buf[:pending] = self._buf[self._start : self._end]
+        self._start = 0
+        self._end = pending
+
+    def __iter__(self) -> Iterator[TuyaFrame]:
+        """Yield every complete, valid frame currently in the buffer."""
+        buf = self._buf
+        view = memoryview(buf)
+        trailer_len = HMAC_TRAILER_LEN if self.hmac_key else CRC_TRAILER_LEN
+        while self._end - self._start >= HEADER.size:
+            start = self._start
+            if not buf.startswith(PREFIX_55AA, start):
+                self._resync(start + 1)
+                continue
+
+            _, seqno, cmd, length = HEADER.unpack_from(buf, start)
+            if length < trailer_len or length > self.max_frame_size:
+                self._drop(start)
+                continue
+
+            frame_end = start + HEADER.size + length
+            if frame_end > self._end:
+                # Incomplete frame, wait for more data.
+                break
+
+            if not buf.startswith(SUFFIX_55AA, frame_end - 4) or not self._verify(
+                view, start, frame_end - 4
+            ):
+                self._drop(start)
+                continue
+
+            self._start = frame_end
+            body_start = start + HEADER.size
+            body_end = frame_end - trailer_len
+            retcode = None
+            if (
+                self.has_retcode
+                and body_end - body_start >= RETCODE.size
+                and buf.startswith(b"\x00\x00\x00", body_start)
+            ):
+                (retcode,) = RETCODE.unpack_from(buf, body_start)
+                body_start += RETCODE.size
+
+            self.frames_parsed += 1
+            yield TuyaFrame(seqno, cmd, retcode, view[body_start:body_end])
+
+        if self._start == self._end:
+            self._start = self._end = 0
+
+    def _verify(self, view: memoryview, start: int, checksum_end: int) -> bool:
+        """Check the CRC32 or HMAC trailer of the frame starting at ``start``."""
+        if self.hmac_key:
+            signed_end = checksum_end - 32
+            expected = hmac.new(self.hmac_key, view[start:signed_end], sha256).digest()
+            return hmac.compare_digest(expected, view[signed_end:checksum_end])
+        signed_end = checksum_end - 4
+        (crc,) = struct.unpack_from(">I", view, signed_end)
+        return zlib.crc32(view[start:signed_end]) & 0xFFFFFFFF == crc
+
+    def _drop(self, start: int) -> None:
+        """Drop a corrupt frame and resynchronise on the next prefix."""
+        self.frames_dropped += 1
+        self._resync(start + 1)
+
+    def _resync(self, search_from: int) -> None:
+        """Skip ahead to the next frame prefix in the buffer."""
+        found = self._buf.find(PREFIX_55AA, search_from, self._end)
+        if found == -1:
+            # Keep a possible partial prefix at the end of the buffer.
+            found = max(search_from, self._end - (len(PREFIX_55AA) - 1))
+        self.bytes_discarded += found - self._start
+        self._start = found
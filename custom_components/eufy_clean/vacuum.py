@@ -11,10 +11,12 @@ from homeassistant.components.vacuum import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    COMMAND_SET_DPS,
     CONF_DEVICE_ID,
     CONF_MODEL,
     DOMAIN,
@@ -58,6 +60,7 @@ class EufyCleanVacuum(
         | VacuumEntityFeature.RETURN_HOME
         | VacuumEntityFeature.FAN_SPEED
         | VacuumEntityFeature.STATE
+        | VacuumEntityFeature.SEND_COMMAND
     )
 
     def __init__(
@@ -77,6 +80,11 @@ class EufyCleanVacuum(
         }
         self._attr_fan_speed_list = FAN_SPEEDS
 
+    @property
+    def available(self) -> bool:
+        """Return True if live or restored data is available."""
+        return super().available or self.coordinator.stale
+
     @property
     def state(self) -> str | None:
         """Return the state of the vacuum."""
@@ -130,7 +138,13 @@ class EufyCleanVacuum(
         if self.coordinator.data is None:
             return {}
 
-        attrs = {}
+        attrs: dict[str, Any] = {
+            "stale": self.coordinator.stale,
+            "health": self.coordinator.api.health.state,
+        }
+
+        if self.coordinator.last_seen:
+            attrs["last_seen"] = self.coordinator.last_seen
 
         if self.error:
             attrs["error"] = self.error
@@ -169,3 +183,27 @@ class EufyCleanVacuum(
 
         await self.coordinator.api.async_set_fan_speed(fan_speed)
         await self.coordinator.async_request_refresh()
+
+    async def async_send_command(
+        self,
+        command: str,
+        params: dict[str, Any] | list[Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Write raw DPS values (command ``set_dps`` with a DPS dict)."""
+        if command != COMMAND_SET_DPS or not isinstance(params, dict):
+            raise ServiceValidationError(
+                f"Unsupported command {command}: use {COMMAND_SET_DPS} "
+                "with a dict of DPS values as params"
+            )
+
+        try:
+            delivered = await self.coordinator.api.async_send_dps(params)
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+
+        if not delivered:
+            raise HomeAssistantError(
+                f"DPS write {params} to {self.coordinator.api.device_ip} failed"
+            )
+        await self.coordinator.async_request_refresh()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark the import time and memory of the integration at HA startup.
+
+Each measurement runs in a fresh interpreter. Home Assistant's own modules
+(and aiohttp) are imported first because HA has loaded them long before it
+imports a custom integration, so only the integration's own cost is measured.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+RUNS = 5
+
+# Modules HA imports when it sets up the config entry at startup
+MODULES = (
+    "custom_components.eufy_clean",
+    "custom_components.eufy_clean.vacuum",
+)
+# Modules that should only be loaded when a device connects or a flow runs
+LAZY_MODULES = ("tinytuya", "cryptography")
+
+PROBE = """
+import json, sys, time, tracemalloc
+import aiohttp
+import homeassistant.helpers.update_coordinator
+import homeassistant.helpers.storage
+import homeassistant.components.vacuum
+
+before = {{m for m in {lazy!r} if m in sys.modules}}
+tracemalloc.start()
+start = time.perf_counter()
+for module in {modules!r}:
+    __import__(module)
+elapsed = time.perf_counter() - start
+_, peak = tracemalloc.get_traced_memory()
+print(json.dumps({{
+    "seconds": elapsed,
+    "peak_bytes": peak,
+    "loaded": [m for m in {lazy!r} if m in sys.modules and m not in before],
+}}))
+"""
+
+
+def measure() -> dict:
+    """Import the integration once in a fresh interpreter."""
+    code = PROBE.format(modules=MODULES, lazy=LAZY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    """Run the benchmark."""
+    print("=" * 70)
+    print("Eufy Clean import benchmark")
+    print("=" * 70)
+
+    results = [measure() for _ in range(RUNS)]
+    seconds = [result["seconds"] * 1000 for result in results]
+    peak = max(result["peak_bytes"] for result in results) / 1024
+
+    print(f"Import time: median {statistics.median(seconds):.1f} ms, ", end="")
+    print(f"min {min(seconds):.1f} ms over {RUNS} runs")
+    print(f"Peak traced memory: {peak:.0f} KiB")
+
+    loaded = results[0]["loaded"]
+    if loaded:
+        print(f"✗ Heavy modules imported at startup: {', '.join(loaded)}")
+        return False
+
+    print("✓ tinytuya and cryptography are not imported at startup")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark the 55AA frame parser in frames per second."""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add custom_components to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components"))
+
+from eufy_clean.tuya_frame import TuyaFrameParser, pack_frame
+
+# Typical sizes: basic status push, position update, full map DPS push
+SCENARIOS = {
+    "status (96 B)": 96,
+    "position (256 B)": 256,
+    "map (16 KiB)": 16 * 1024,
+}
+CHUNK_SIZES = (64, 1460, 65536)
+DURATION = 1.0
+
+
+def run(payload_size: int, chunk_size: int) -> float:
+    """Return parsed frames per second for one scenario."""
+    frames = [
+        pack_frame(seq, 8, os.urandom(payload_size), retcode=0) for seq in range(64)
+    ]
+    stream = b"".join(frames)
+    chunks = [
+        memoryview(stream)[pos : pos + chunk_size]
+        for pos in range(0, len(stream), chunk_size)
+    ]
+    parser = TuyaFrameParser()
+
+    parsed = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        for chunk in chunks:
+            view = parser.get_buffer(len(chunk))
+            view[: len(chunk)] = chunk
+            parser.buffer_updated(len(chunk))
+            for _ in parser:
+                parsed += 1
+    elapsed = time.perf_counter() - start
+    assert parser.frames_dropped == 0
+    return parsed / elapsed
+
+
+def main():
+    """Run all scenarios."""
+    print("=" * 70)
+    print("Tuya 55AA frame parser benchmark")
+    print("=" * 70)
+    for name, size in SCENARIOS.items():
+        for chunk_size in CHUNK_SIZES:
+            fps = run(size, chunk_size)
+            print(f"{name:<18} reads of {chunk_size:>6} B: {fps:>12,.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ from custom_components.eufy_clean.const import (
     CONF_LOCAL_KEY,
     CONF_MODEL,
 )
+from custom_components.eufy_clean.device_profile import DEFAULT_PROFILE
+from custom_components.eufy_clean.health import HealthTracker
 
 # Load the integration for tests
 pytest_plugins = "pytest_homeassistant_custom_component"
@@ -24,6 +26,22 @@ def auto_enable_custom_integrations(enable_custom_integrations):
     yield
 
 
+@pytest.fixture(autouse=True)
+def isolate_config_dir(hass, tmp_path):
+    """Keep the history logs of each test in its own config dir."""
+    hass.config.config_dir = str(tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def mock_beacon_listener():
+    """Do not bind the discovery port in tests."""
+    with patch(
+        "custom_components.eufy_clean.BeaconListener.async_start",
+        new_callable=AsyncMock,
+    ) as mock:
+        yield mock
+
+
 @pytest.fixture
 def mock_config_entry_data():
     """Return mock config entry data."""
@@ -81,6 +99,8 @@ def mock_eufy_api():
     """Return a mocked EufyCleanAPI."""
     with patch("custom_components.eufy_clean.eufy_api.EufyCleanAPI") as mock:
         api = MagicMock()
+        api.health = HealthTracker()
+        api.profile = DEFAULT_PROFILE
         api.async_connect = AsyncMock()
         api.async_disconnect = AsyncMock()
         api.async_get_status = AsyncMock(
@@ -119,6 +139,12 @@ def mock_eufy_cloud_api():
                 }
             ]
         )
+        api.async_get_scenes = AsyncMock(
+            return_value=[
+                {"id": 1, "name": "Kitchen"},
+                {"id": 2, "name": "Bedroom"},
+            ]
+        )
         mock.return_value = api
         yield mock
 
@@ -126,7 +152,7 @@ def mock_eufy_cloud_api():
 @pytest.fixture
 def mock_tinytuya():
     """Return a mocked tinytuya Device."""
-    with patch("custom_components.eufy_clean.eufy_api.tinytuya.Device") as mock:
+    with patch("tinytuya.Device") as mock:
         device = MagicMock()
         device.status = MagicMock(
             return_value={
@@ -139,6 +165,10 @@ def mock_tinytuya():
                 }
             }
         )
+        device.updatedps = MagicMock(
+            return_value={"dps": {"1": False, "15": "standby", "104": 100}}
+        )
+        device.receive = MagicMock(return_value=None)
         device.set_multiple_values = MagicMock(return_value=True)
         device.set_socketPersistent = MagicMock()
         device.set_socketTimeout = MagicMock()
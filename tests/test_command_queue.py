@@ -0,0 +1,23 @@
+"""Test the offline command queue."""
+
+from custom_components.eufy_clean.command_queue import OfflineCommandQueue
+
+
+async def test_expiry_timers_follow_the_queue():
+    """Test timers are cancelled on take and armed again on restore."""
+    queue = OfflineCommandQueue(ttl=60)
+    first = queue.add({"1": True})
+    queue.add({"2": 0})
+
+    merged, batch = queue.take()
+    assert merged == {"1": True, "2": 0}
+    assert all(entry.timer is None for entry in batch)
+
+    queue.restore(batch)
+    assert all(entry.timer is not None for entry in batch)
+    timers = [entry.timer for entry in batch]
+
+    queue.clear()
+    assert all(timer.cancelled() for timer in timers)
+    assert first.result() is False
+    assert len(queue) == 0
@@ -6,7 +6,7 @@ from homeassistant import config_entries, data_entry_flow
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.eufy_clean.const import DOMAIN
+from custom_components.eufy_clean.const import DOMAIN, STORAGE_KEY_SCENES
 
 
 async def test_form_user(hass, mock_eufy_cloud_api):
@@ -39,6 +39,70 @@ async def test_form_user(hass, mock_eufy_cloud_api):
     assert len(mock_setup_entry.mock_calls) == 1
 
 
+async def test_form_user_caches_scenes(hass, hass_storage, mock_eufy_cloud_api):
+    """Test the cleaning scenes are fetched once while logged in."""
+    mock_eufy_cloud_api.return_value.async_get_devices.return_value[0]["model"] = (
+        "T2351"
+    )
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with patch("custom_components.eufy_clean.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {CONF_EMAIL: "test@example.com", CONF_PASSWORD: "test_password"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    mock_eufy_cloud_api.return_value.async_get_scenes.assert_awaited_once_with(
+        "test_device_id"
+    )
+    stored = hass_storage[f"{STORAGE_KEY_SCENES}.test_device_id"]["data"]
+    assert stored["scenes"] == [[1, "Kitchen"], [2, "Bedroom"]]
+    assert CONF_PASSWORD not in result["data"]
+
+
+async def test_form_user_without_scenes(hass, hass_storage, mock_eufy_cloud_api):
+    """Test setup goes on when the cloud has no scenes for the model."""
+    mock_eufy_cloud_api.return_value.async_get_devices.return_value[0]["model"] = (
+        "T2351"
+    )
+    mock_eufy_cloud_api.return_value.async_get_scenes.side_effect = ValueError(
+        "Tuya API error [PERMISSION_DENIED]"
+    )
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with patch("custom_components.eufy_clean.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {CONF_EMAIL: "test@example.com", CONF_PASSWORD: "test_password"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert f"{STORAGE_KEY_SCENES}.test_device_id" not in hass_storage
+
+
+async def test_form_user_skips_scenes_of_models_without_scenes(
+    hass, mock_eufy_cloud_api
+):
+    """Test scenes are only fetched for models taking scene commands."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with patch("custom_components.eufy_clean.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {CONF_EMAIL: "test@example.com", CONF_PASSWORD: "test_password"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    mock_eufy_cloud_api.return_value.async_get_scenes.assert_not_awaited()
+
+
 async def test_form_user_invalid_auth(hass, mock_eufy_cloud_api):
     """Test invalid authentication."""
     mock_eufy_cloud_api.return_value.async_login.side_effect = ValueError(
@@ -152,12 +216,57 @@ async def test_options_flow(hass):
 
     assert result["type"] == data_entry_flow.FlowResultType.FORM
     assert result["step_id"] == "init"
+    assert CONF_EMAIL not in result["data_schema"].schema
 
     result = await hass.config_entries.options.async_configure(
         result["flow_id"],
-        user_input={"device_ip": "192.168.1.101"},
+        user_input={"device_ip": "192.168.1.101", "command_queue_ttl": 120},
     )
 
     assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
     # IP is now stored in config entry data, not options data
     assert entry.data["device_ip"] == "192.168.1.101"
+    assert entry.options == {
+        "command_queue_ttl": 120,
+        "proxy_port": 0,
+        "proxy_host": "127.0.0.1",
+    }
+
+
+async def test_options_flow_refreshes_scenes(hass, hass_storage, mock_eufy_cloud_api):
+    """Test credentials in the options refresh the scenes and are not kept."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "device_id": "test_device_id",
+            "local_key": "test_local_key",
+            "device_ip": "192.168.1.100",
+            "model": "T2351",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    with patch("custom_components.eufy_clean.async_setup_entry", return_value=True):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                "device_ip": "192.168.1.100",
+                CONF_EMAIL: "test@example.com",
+                CONF_PASSWORD: "test_password",
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    mock_eufy_cloud_api.return_value.async_get_scenes.assert_awaited_once_with(
+        "test_device_id"
+    )
+    stored = hass_storage[f"{STORAGE_KEY_SCENES}.test_device_id"]["data"]
+    assert stored["scenes"] == [[1, "Kitchen"], [2, "Bedroom"]]
+    assert entry.options == {
+        "command_queue_ttl": 0,
+        "proxy_port": 0,
+        "proxy_host": "127.0.0.1",
+    }
+    assert CONF_PASSWORD not in entry.data
@@ -0,0 +1,43 @@
+"""Test the device DPS profiles."""
+
+import pytest
+
+from custom_components.eufy_clean.device_profile import (
+    DEFAULT_PROFILE,
+    SCENE_PROFILE,
+    get_device_profile,
+)
+
+
+def test_validate_dps_normalizes_keys():
+    """Test raw writes are keyed by DPS id string."""
+    assert DEFAULT_PROFILE.validate_dps({101: True, "5": 3}) == {"101": True, "5": 3}
+
+
+@pytest.mark.parametrize(
+    "dps",
+    [
+        {},
+        {"104": 50},
+        {"101": 1},
+        {"1": "true"},
+    ],
+)
+def test_validate_dps_rejects_invalid_writes(dps):
+    """Test empty, read-only and mistyped writes are rejected."""
+    with pytest.raises(ValueError):
+        DEFAULT_PROFILE.validate_dps(dps)
+
+
+@pytest.mark.parametrize(
+    ("model", "profile"),
+    [
+        ("T2351", SCENE_PROFILE),
+        ("t2080", SCENE_PROFILE),
+        ("T2250", DEFAULT_PROFILE),
+        (None, DEFAULT_PROFILE),
+    ],
+)
+def test_get_device_profile(model, profile):
+    """Test only the X10 and S1 models take scene commands."""
+    assert get_device_profile(model) is profile
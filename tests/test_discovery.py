@@ -0,0 +1,44 @@
+"""Test the discovery beacon listener."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.eufy_clean.discovery import BeaconListener
+from custom_components.eufy_clean.executor import DeviceIOExecutor
+
+
+@pytest.fixture
+def mock_beacon_listener():
+    """Bind the discovery port for real in these tests."""
+    return None
+
+
+async def test_decryption_loaded_on_first_beacon(socket_enabled):
+    """Test tinytuya is only loaded once a beacon arrives."""
+    executor = DeviceIOExecutor(max_workers=1, max_queued=1)
+    listener = BeaconListener(port=0)
+    seen = []
+    beacon = json.dumps({"gwId": "test_device_id", "ip": "10.0.0.5"}).encode()
+
+    with patch(
+        "custom_components.eufy_clean.discovery._load_decrypt",
+        return_value=bytes.decode,
+    ) as load:
+        await listener.async_start(executor)
+        listener.register("test_device_id", seen.append)
+        load.assert_not_called()
+
+        # Beacons are dropped until the decryption is loaded
+        for _ in range(100):
+            listener.datagram_received(beacon, ("10.0.0.5", 6667))
+            if seen:
+                break
+            await asyncio.sleep(0.01)
+
+    assert load.call_count == 1
+    assert seen == ["10.0.0.5"]
+    listener.close()
+    executor.shutdown()
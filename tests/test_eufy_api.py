@@ -0,0 +1,349 @@
+"""Test the Eufy Clean local API client."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+import tinytuya
+
+from custom_components.eufy_clean.const import MIN_SOCKET_TIMEOUT, RTT_MIN_SAMPLES
+from custom_components.eufy_clean.device_profile import DeviceProfile
+from custom_components.eufy_clean.eufy_api import EufyCleanAPI
+
+
+def _create_api() -> EufyCleanAPI:
+    """Create an API client for the mocked device."""
+    return EufyCleanAPI(
+        device_id="test_device_id",
+        local_key="test_local_key",
+        device_ip="192.168.1.100",
+    )
+
+
+async def test_connect_requests_dps_push(mock_tinytuya):
+    """Test connecting asks the device to push all profile DPS."""
+    api = _create_api()
+
+    await api.async_connect()
+
+    device = mock_tinytuya.return_value
+    device.updatedps.assert_called_once()
+    requested = device.updatedps.call_args[0][0]
+    assert 15 in requested
+    assert 104 in requested
+    device.receive.assert_not_called()
+
+
+async def test_connect_waits_for_separate_push(mock_tinytuya):
+    """Test the push is awaited when the device only acknowledges."""
+    device = mock_tinytuya.return_value
+    device.updatedps.return_value = None
+    device.receive.return_value = {"dps": {"104": 42}}
+    device.status.return_value = {}
+    api = _create_api()
+
+    await api.async_connect()
+    status = await api.async_get_status()
+
+    device.receive.assert_called_once()
+    assert status["battery"] == 42
+
+
+async def test_status_merges_pushed_dps(mock_tinytuya):
+    """Test status responses are merged with previously pushed DPS."""
+    device = mock_tinytuya.return_value
+    device.updatedps.return_value = {"dps": {"101": False, "104": 20}}
+    api = _create_api()
+
+    await api.async_connect()
+    status = await api.async_get_status()
+
+    assert status["raw_dps"]["101"] is False
+    assert status["battery"] == 100
+    assert status["state"] == "docked"
+
+
+async def test_expired_deadline_skips_request(mock_tinytuya):
+    """Test no request is sent once the deadline has passed."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+
+    assert await api.async_get_status(deadline=time.monotonic() - 1) is None
+    assert not await api.async_start(deadline=time.monotonic() - 1)
+    device.status.assert_not_called()
+    device.set_multiple_values.assert_not_called()
+
+
+async def test_connect_is_bounded_by_deadline(mock_tinytuya):
+    """Test the first connect caps its socket timeouts by the deadline."""
+    api = _create_api()
+    budget = 0.4
+
+    await api.async_connect(deadline=time.monotonic() + budget)
+
+    device = mock_tinytuya.return_value
+    assert mock_tinytuya.call_args.kwargs["connection_timeout"] <= budget
+    assert all(
+        call.args[0] <= budget for call in device.set_socketTimeout.call_args_list
+    )
+    device.updatedps.assert_called_once()
+
+
+async def test_socket_timeout_follows_rtt(mock_tinytuya):
+    """Test the socket timeout shrinks once fast round trips were measured."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+
+    with patch("custom_components.eufy_clean.eufy_api.STATUS_FRESHNESS", 0):
+        for _ in range(RTT_MIN_SAMPLES + 1):
+            await api.async_get_status()
+
+    timeout = device.set_socketTimeout.call_args[0][0]
+    assert timeout == MIN_SOCKET_TIMEOUT
+    assert api.rtt.as_dict()["samples"] == RTT_MIN_SAMPLES + 1
+
+
+async def test_concurrent_status_requests_share_one_query(mock_tinytuya):
+    """Test concurrent and back-to-back callers share one device query."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+
+    results = await asyncio.gather(*(api.async_get_status() for _ in range(3)))
+    assert await api.async_get_status() is results[0]
+
+    assert all(result is results[0] for result in results)
+    device.status.assert_called_once()
+
+
+async def test_command_invalidates_cached_status(mock_tinytuya):
+    """Test the status is queried again right after a command."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+
+    await api.async_get_status()
+    assert await api.async_start()
+    await api.async_get_status()
+
+    assert device.status.call_count == 2
+
+
+async def test_polls_query_only_volatile_dps(mock_tinytuya):
+    """Test polls after a full query ask only for the volatile DPS."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+    device.receive.return_value = {"dps": {"104": 90}}
+
+    with patch("custom_components.eufy_clean.eufy_api.STATUS_FRESHNESS", 0):
+        await api.async_get_status()
+        status = await api.async_get_status()
+
+    device.status.assert_called_once()
+    device.generate_payload.assert_called_once_with(
+        tinytuya.DP_QUERY, {"15": None, "104": None, "106": None}
+    )
+    assert status["battery"] == 90
+    assert status["raw_dps"]["102"] == 1
+
+
+async def test_targeted_query_falls_back_to_full_query(mock_tinytuya):
+    """Test firmware ignoring targeted queries is polled in full."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+
+    with patch("custom_components.eufy_clean.eufy_api.STATUS_FRESHNESS", 0):
+        for _ in range(3):
+            assert await api.async_get_status() is not None
+
+    device.generate_payload.assert_called_once()
+    assert device.status.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        {"dps": {"1": True, "15": "running", "104": 80}},
+        {"Err": "904", "Error": "Unexpected Payload from Device"},
+    ],
+)
+async def test_targeted_query_ignored_or_refused(mock_tinytuya, reply):
+    """Test replies with unrequested DPS or an error stop targeted queries."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+    device.receive.return_value = reply
+
+    with patch("custom_components.eufy_clean.eufy_api.STATUS_FRESHNESS", 0):
+        for _ in range(3):
+            assert await api.async_get_status() is not None
+
+    device.generate_payload.assert_called_once()
+    assert device.status.call_count == (2 if "dps" in reply else 3)
+
+
+async def test_queued_commands_flush_as_one_frame(mock_tinytuya):
+    """Test commands for an unreachable device are merged and sent later."""
+    api = EufyCleanAPI(
+        device_id="test_device_id",
+        local_key="test_local_key",
+        device_ip="192.168.1.100",
+        command_queue_ttl=60,
+    )
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+    device.set_multiple_values.return_value = {"Err": "901", "Error": "Network"}
+
+    start = asyncio.ensure_future(api.async_start())
+    fan_speed = asyncio.ensure_future(api.async_set_fan_speed("Max"))
+    pause = asyncio.ensure_future(api.async_pause())
+    await asyncio.sleep(0.1)
+    assert not start.done()
+
+    device.set_multiple_values.reset_mock()
+    device.set_multiple_values.return_value = True
+    await api.async_get_status()
+
+    assert await asyncio.gather(start, fan_speed, pause) == [True, True, True]
+    device.set_multiple_values.assert_called_once_with({"1": False, "2": 0, "102": 3})
+
+
+async def test_queued_command_expires(mock_tinytuya):
+    """Test a queued command resolves to False once its TTL runs out."""
+    api = EufyCleanAPI(
+        device_id="test_device_id",
+        local_key="test_local_key",
+        device_ip="192.168.1.100",
+        command_queue_ttl=0.05,
+    )
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+    device.set_multiple_values.return_value = {"Err": "901", "Error": "Network"}
+
+    assert await api.async_start() is False
+
+
+async def test_rejected_command_is_not_queued(mock_tinytuya):
+    """Test a command the device answers with an error is not retried."""
+    api = EufyCleanAPI(
+        device_id="test_device_id",
+        local_key="test_local_key",
+        device_ip="192.168.1.100",
+        command_queue_ttl=60,
+    )
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+    device.set_multiple_values.return_value = {"Err": "904", "Error": "Payload"}
+
+    assert await api.async_start() is False
+
+    device.set_multiple_values.return_value = True
+    await api.async_get_status()
+    device.set_multiple_values.assert_called_once()
+
+
+async def test_queued_command_wait_ends_at_deadline(mock_tinytuya):
+    """Test the caller gets False at the deadline while the command waits."""
+    api = EufyCleanAPI(
+        device_id="test_device_id",
+        local_key="test_local_key",
+        device_ip="192.168.1.100",
+        command_queue_ttl=60,
+    )
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+    device.set_multiple_values.return_value = {"Err": "905", "Error": "Offline"}
+
+    assert await api.async_start(deadline=time.monotonic() + 0.1) is False
+
+    device.set_multiple_values.reset_mock()
+    device.set_multiple_values.return_value = True
+    await api.async_get_status()
+    device.set_multiple_values.assert_called_once_with({"1": True, "2": 0})
+
+
+async def test_disconnect_cancels_flush(mock_tinytuya):
+    """Test disconnecting stops a delivery in progress and fails its commands."""
+    api = EufyCleanAPI(
+        device_id="test_device_id",
+        local_key="test_local_key",
+        device_ip="192.168.1.100",
+        command_queue_ttl=60,
+    )
+    await api.async_connect()
+    delivering = asyncio.Event()
+
+    async def deliver(commands, deadline=None):
+        delivering.set()
+        await asyncio.sleep(60)
+
+    with patch.object(api, "_deliver_command", deliver):
+        start = asyncio.ensure_future(api.async_start())
+        await delivering.wait()
+        await api.async_disconnect()
+
+        assert await start is False
+
+    """Test raw DPS writes are checked before reaching the device."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+
+    with pytest.raises(ValueError):
+        await api.async_send_dps({"104": 50})
+    assert await api.async_send_dps({101: True})
+
+    device.set_multiple_values.assert_called_once_with({"101": True})
+
+
+async def test_dps_listeners_receive_changes(mock_tinytuya):
+    """Test DPS listeners are called with the values that changed."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+    changes = []
+    api.async_add_dps_listener(changes.append)
+
+    device.status.return_value = {"dps": {"1": False, "104": 80}}
+    await api.async_get_status()
+
+    assert changes == [{"104": 80}]
+
+
+async def test_failing_dps_listener_keeps_poll(mock_tinytuya):
+    """Test a listener raising is logged and the poll still succeeds."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+    changes = []
+
+    def _fail(dps):
+        raise ValueError("broken listener")
+
+    api.async_add_dps_listener(_fail)
+    api.async_add_dps_listener(changes.append)
+
+    device.status.return_value = {"dps": {"1": False, "104": 80}}
+    status = await api.async_get_status()
+
+    assert status["battery"] == 80
+    assert changes == [{"104": 80}]
+
+
+async def test_clean_scene_needs_scene_dps(mock_tinytuya):
+    """Test scenes are written to the profile's scene DPS only."""
+    api = _create_api()
+    await api.async_connect()
+    device = mock_tinytuya.return_value
+
+    with pytest.raises(ValueError):
+        await api.async_clean_scene(3)
+    api.profile = DeviceProfile(name="scenes", dps=api.profile.dps, scene_dps="5")
+    assert await api.async_clean_scene(3)
+
+    device.set_multiple_values.assert_called_once_with({"5": 3})
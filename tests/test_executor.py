@@ -0,0 +1,46 @@
+"""Test the bounded device I/O executor."""
+
+import asyncio
+import threading
+
+import pytest
+
+from custom_components.eufy_clean.executor import (
+    DeviceIOExecutor,
+    ExecutorSaturatedError,
+)
+
+
+async def test_run_returns_result():
+    """Test a job runs in the pool and its result is returned."""
+    executor = DeviceIOExecutor(max_workers=1, max_queued=1)
+
+    assert await executor.async_run(sum, [1, 2, 3]) == 6
+    assert executor.metrics["completed"] == 1
+    executor.shutdown()
+
+
+async def test_sheddable_jobs_rejected_when_saturated():
+    """Test polls are shed while the queue is full but commands are not."""
+    executor = DeviceIOExecutor(max_workers=1, max_queued=1)
+    release = threading.Event()
+
+    blocking = asyncio.ensure_future(executor.async_run(release.wait))
+    await asyncio.sleep(0.05)
+    queued = asyncio.ensure_future(executor.async_run(lambda: "poll", sheddable=True))
+    await asyncio.sleep(0)
+
+    assert executor.metrics["active"] == 1
+    assert executor.metrics["queued"] == 1
+
+    with pytest.raises(ExecutorSaturatedError):
+        await executor.async_run(lambda: "poll", sheddable=True)
+    command = asyncio.ensure_future(executor.async_run(lambda: "command"))
+
+    release.set()
+    assert await asyncio.gather(blocking, queued, command) == [True, "poll", "command"]
+    metrics = executor.metrics
+    assert metrics["shed"] == 1
+    assert metrics["queued"] == 0
+    assert metrics["wait_max_ms"] > 0
+    executor.shutdown()
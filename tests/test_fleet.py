@@ -0,0 +1,62 @@
+"""Test the fleet command dispatch."""
+
+import asyncio
+import time
+
+from custom_components.eufy_clean.fleet import async_dispatch, summarize
+
+
+async def test_dispatch_limits_parallelism_and_staggers():
+    """Test at most `parallelism` jobs run at once, started apart."""
+    running = 0
+    peak = 0
+    starts: list[float] = []
+
+    async def job() -> bool:
+        nonlocal running, peak
+        starts.append(time.monotonic())
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return True
+
+    results = await async_dispatch(
+        {f"vacuum.{i}": job for i in range(4)}, parallelism=2, stagger=0.01
+    )
+
+    assert all(result.success for result in results.values())
+    assert peak == 2
+    assert all(b - a >= 0.009 for a, b in zip(starts, starts[1:], strict=False))
+
+
+async def test_dispatch_retries_failed_devices():
+    """Test failed devices are retried and invalid commands are not."""
+    attempts = {"flaky": 0, "invalid": 0}
+
+    async def flaky() -> bool:
+        attempts["flaky"] += 1
+        return attempts["flaky"] > 1
+
+    async def invalid() -> bool:
+        attempts["invalid"] += 1
+        raise ValueError("DPS 104 is not writable")
+
+    async def down() -> bool:
+        return False
+
+    results = await async_dispatch(
+        {"flaky": flaky, "invalid": invalid, "down": down},
+        parallelism=3,
+        stagger=0,
+        retries=2,
+    )
+
+    assert results["flaky"].success and results["flaky"].attempts == 2
+    assert results["invalid"].attempts == 1
+    assert results["down"].attempts == 3
+
+    report = summarize(results)
+    assert report["succeeded"] == 1
+    assert report["failed"] == 2
+    assert report["devices"]["invalid"]["error"] == "DPS 104 is not writable"
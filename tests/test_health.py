@@ -0,0 +1,52 @@
+"""Test the device health state machine."""
+
+from custom_components.eufy_clean.health import DeviceHealth, HealthTracker
+
+
+def test_state_transitions_and_backoff():
+    """Test failures degrade the device, then back off polling once offline."""
+    health = HealthTracker(interval=30, max_interval=300, offline_after=3)
+
+    assert health.record_failure() is DeviceHealth.DEGRADED
+    assert health.poll_interval == 30
+    assert health.record_failure() is DeviceHealth.DEGRADED
+    assert health.record_failure() is DeviceHealth.OFFLINE
+
+    intervals = []
+    for _ in range(4):
+        intervals.append(health.poll_interval)
+        health.record_failure()
+    assert intervals == [60, 120, 240, 300]
+
+    assert health.record_success() is True
+    assert health.state is DeviceHealth.ONLINE
+    assert health.poll_interval == 30
+
+
+def test_failure_logging_is_rate_limited():
+    """Test only the first failure of a streak is logged loudly."""
+    health = HealthTracker(log_interval=900)
+
+    assert health.should_log() is True
+    health.record_failure()
+    assert health.should_log() is False
+
+    health.record_success()
+    assert health.should_log() is True
+
+
+def test_wake_restarts_fast_polling_once():
+    """Test a sign of life resets the backoff, once per interval."""
+    health = HealthTracker(interval=30, offline_after=3)
+    assert health.wake() is False
+
+    for _ in range(6):
+        health.record_failure()
+    assert health.poll_interval > 30
+
+    assert health.wake() is True
+    assert health.poll_interval == 30
+    assert health.wake() is False
+
+    assert health.record_failure() is DeviceHealth.OFFLINE
+    assert health.poll_interval == 60
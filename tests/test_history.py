@@ -0,0 +1,115 @@
+"""Test the binary history log."""
+
+from custom_components.eufy_clean.history import (
+    FILE_HEADER,
+    INDEX_STRIDE,
+    HistoryLog,
+)
+
+
+def _log(tmp_path) -> HistoryLog:
+    """Return an opened history log."""
+    history = HistoryLog(tmp_path / "history" / "device.log")
+    history.open()
+    return history
+
+
+def test_sessions_survive_restart(tmp_path):
+    """Test session summaries are indexed again when the log is opened."""
+    history = _log(tmp_path)
+    history.start_session(1000.0, 90)
+    history.record_error("2")
+    history.record_error("2")
+    history.record_error("5")
+    history.end_session(2800.0, 60)
+    history.start_session(5000.0, None)
+    history.end_session(5100.0, 100)
+    history.flush()
+
+    reopened = _log(tmp_path)
+    first, second = reopened.query_sessions()
+
+    assert (first.start, first.end) == (1000.0, 2800.0)
+    assert first.errors == ("2", "5")
+    assert first.battery_used == 30
+    assert second.battery_used is None
+    assert reopened.query_sessions(start=2000.0) == [second]
+    assert reopened.query_sessions(end=4000.0) == [first]
+
+
+def test_dps_changes_round_trip(tmp_path):
+    """Test every value type is logged and read back."""
+    history = _log(tmp_path)
+    changes = {"1": True, "2": -12, "3": "Standard", "4": 2.5, "5": None}
+    history.record_dps(10.0, changes)
+    history.flush()
+
+    assert _log(tmp_path).query_dps() == [(10.0, changes)]
+
+
+def test_oversized_dps_value_is_skipped(tmp_path):
+    """Test values too long for a record are left out of the change."""
+    history = _log(tmp_path)
+    history.record_dps(10.0, {"104": 80, "165": "x" * 70000, "166": ["y"] * 20000})
+    history.flush()
+
+    assert _log(tmp_path).query_dps() == [(10.0, {"104": 80})]
+
+
+def test_dps_time_range(tmp_path):
+    """Test range queries start from the sparse index and honour the limit."""
+    history = _log(tmp_path)
+    for second in range(INDEX_STRIDE * 5):
+        history.record_dps(float(second), {"104": second})
+        if second % 50 == 0:
+            history.flush()
+    history.flush()
+
+    changes = history.query_dps(start=200.0, end=209.0)
+    assert [time for time, _ in changes] == [float(s) for s in range(200, 210)]
+    assert [dps["104"] for _, dps in history.query_dps(end=302.0, limit=3)] == [
+        300,
+        301,
+        302,
+    ]
+    assert _log(tmp_path).query_dps(start=200.0, end=209.0) == changes
+
+
+def test_clock_steps_back(tmp_path):
+    """Test times stay ordered if the clock goes back."""
+    history = _log(tmp_path)
+    history.record_dps(100.0, {"1": True})
+    history.record_dps(50.0, {"1": False})
+    history.flush()
+
+    assert [time for time, _ in history.query_dps()] == [100.0, 100.0]
+
+
+def test_torn_tail_is_dropped(tmp_path):
+    """Test a record cut short by a crash is dropped on open."""
+    history = _log(tmp_path)
+    history.record_dps(1.0, {"1": True})
+    history.record_dps(2.0, {"1": False})
+    history.flush()
+    size = history.path.stat().st_size
+    with history.path.open("r+b") as file:
+        file.truncate(size - 1)
+
+    reopened = _log(tmp_path)
+    reopened.record_dps(3.0, {"2": 1})
+    reopened.flush()
+
+    assert _log(tmp_path).query_dps() == [(1.0, {"1": True}), (3.0, {"2": 1})]
+
+
+def test_unreadable_log_is_replaced(tmp_path):
+    """Test a file that is not a history log is started over."""
+    path = tmp_path / "history" / "device.log"
+    path.parent.mkdir()
+    path.write_bytes(b"not a history log")
+
+    history = _log(tmp_path)
+
+    assert history.path.stat().st_size == FILE_HEADER.size
+    assert history.query_sessions() == []
+    assert history.query_dps() == []
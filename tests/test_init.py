@@ -5,7 +5,9 @@ from unittest.mock import AsyncMock, patch
 from homeassistant.config_entries import ConfigEntryState
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.eufy_clean.const import DOMAIN
+from custom_components.eufy_clean.const import DATA_STOP_LISTENERS, DOMAIN
+from custom_components.eufy_clean.device_profile import DEFAULT_PROFILE
+from custom_components.eufy_clean.health import HealthTracker
 
 
 async def test_setup_entry(hass, mock_eufy_api, mock_config_entry_data):
@@ -19,6 +21,8 @@ async def test_setup_entry(hass, mock_eufy_api, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_get_status = AsyncMock(
             return_value={
@@ -31,15 +35,16 @@ async def test_setup_entry(hass, mock_eufy_api, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
     assert entry.state == ConfigEntryState.LOADED
     assert DOMAIN in hass.data
     assert entry.entry_id in hass.data[DOMAIN]
+    api_instance.async_get_status.assert_called_once()
 
 
 async def test_setup_entry_connection_error(hass, mock_config_entry_data):
-    """Test setup entry with connection error."""
+    """Test an unreachable device does not block or fail setup."""
     entry = MockConfigEntry(
         domain=DOMAIN,
         data=mock_config_entry_data,
@@ -49,14 +54,20 @@ async def test_setup_entry_connection_error(hass, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock(
             side_effect=Exception("Connection failed")
         )
+        api_instance.async_get_status = AsyncMock(return_value=None)
 
-        assert not await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
 
-    assert entry.state == ConfigEntryState.SETUP_RETRY
+    assert entry.state == ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert not coordinator.last_update_success
+    api_instance.async_get_status.assert_called_once()
 
 
 async def test_unload_entry(hass, mock_eufy_api, mock_config_entry_data):
@@ -70,6 +81,8 @@ async def test_unload_entry(hass, mock_eufy_api, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_get_status = AsyncMock(
@@ -83,14 +96,16 @@ async def test_unload_entry(hass, mock_eufy_api, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         assert await hass.config_entries.async_unload(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
     assert entry.state == ConfigEntryState.NOT_LOADED
     assert entry.entry_id not in hass.data[DOMAIN]
     api_instance.async_disconnect.assert_called_once()
+    # Shared resources closed with the last entry leave no stop listeners
+    assert not hass.data[DATA_STOP_LISTENERS]
 
 
 async def test_update_options(hass, mock_eufy_api, mock_config_entry_data):
@@ -104,6 +119,8 @@ async def test_update_options(hass, mock_eufy_api, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_get_status = AsyncMock(
@@ -117,11 +134,11 @@ async def test_update_options(hass, mock_eufy_api, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         # Update options
         with patch("custom_components.eufy_clean.async_update_options") as mock_update:
             hass.config_entries.async_update_entry(
                 entry, options={"device_ip": "192.168.1.101"}
             )
-            await hass.async_block_till_done()
+            await hass.async_block_till_done(wait_background_tasks=True)
@@ -0,0 +1,114 @@
+"""Test the local proxy sharing the device session."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.eufy_clean.executor import DeviceIOExecutor
+from custom_components.eufy_clean.local_proxy import (
+    CONTROL,
+    DP_QUERY,
+    STATUS,
+    VERSION_HEADER,
+    LocalProxy,
+)
+from custom_components.eufy_clean.tuya_crypto import (
+    decrypt_local_payload,
+    encrypt_local_payload,
+    get_local_key_cipher,
+)
+from custom_components.eufy_clean.tuya_frame import TuyaFrameParser, pack_frame
+
+LOCAL_KEY = "0123456789abcdef"
+
+
+class FakeAPI:
+    """Device session stand-in recording the proxied calls."""
+
+    device_id = "test_device_id"
+    local_key = LOCAL_KEY
+
+    def __init__(self):
+        self.dps = {"1": False, "104": 100}
+        self.listeners = []
+        self.async_get_status = AsyncMock()
+        self.async_send_dps = AsyncMock(return_value=True)
+
+    def async_add_dps_listener(self, listener):
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+
+@pytest.fixture
+async def proxy(socket_enabled):
+    """Run a proxy on a free local port."""
+    executor = DeviceIOExecutor(max_workers=1, max_queued=1)
+    proxy = LocalProxy(FakeAPI(), 0)
+    await proxy.async_start(executor)
+    yield proxy
+    proxy.close()
+    executor.shutdown()
+
+
+async def _read_frame(reader, parser):
+    """Return the next frame sent by the proxy."""
+    while True:
+        for frame in parser:
+            return frame.cmd, frame.retcode, bytes(frame.payload)
+        parser.feed(await asyncio.wait_for(reader.read(4096), 1))
+
+
+async def test_query_and_control_are_proxied(proxy, socket_enabled):
+    """Test queries are answered and writes go through the API."""
+    cipher = get_local_key_cipher(LOCAL_KEY)
+    reader, writer = await asyncio.open_connection("127.0.0.1", proxy.port)
+    parser = TuyaFrameParser()
+
+    query = encrypt_local_payload(cipher, b'{"devId":"test_device_id"}')
+    writer.write(pack_frame(1, DP_QUERY, query))
+    cmd, retcode, payload = await _read_frame(reader, parser)
+    assert (cmd, retcode) == (DP_QUERY, 0)
+    assert json.loads(decrypt_local_payload(cipher, payload))["dps"] == proxy.api.dps
+
+    control = VERSION_HEADER + encrypt_local_payload(cipher, b'{"dps":{"101":true}}')
+    writer.write(pack_frame(2, CONTROL, control))
+    cmd, retcode, _ = await _read_frame(reader, parser)
+    assert (cmd, retcode) == (CONTROL, 0)
+    proxy.api.async_send_dps.assert_awaited_once_with({"101": True})
+
+    writer.close()
+
+
+async def test_changed_dps_pushed_to_every_client(proxy, socket_enabled):
+    """Test DPS changes seen by the integration fan out to all clients."""
+    cipher = get_local_key_cipher(LOCAL_KEY)
+    clients = [await asyncio.open_connection("127.0.0.1", proxy.port) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    for listener in proxy.api.listeners:
+        listener({"104": 99})
+
+    for reader, writer in clients:
+        cmd, _, payload = await _read_frame(reader, TuyaFrameParser())
+        assert cmd == STATUS
+        message = decrypt_local_payload(cipher, payload[len(VERSION_HEADER) :])
+        assert json.loads(message) == {"dps": {"104": 99}}
+        writer.close()
+
+
+async def test_control_without_json_object_is_rejected(proxy, socket_enabled):
+    """Test writes that are not JSON objects are answered with an error."""
+    cipher = get_local_key_cipher(LOCAL_KEY)
+    reader, writer = await asyncio.open_connection("127.0.0.1", proxy.port)
+    parser = TuyaFrameParser()
+
+    for seqno, message in enumerate((b"[1,2]", b'{"dps":[1]}'), 1):
+        control = VERSION_HEADER + encrypt_local_payload(cipher, message)
+        writer.write(pack_frame(seqno, CONTROL, control))
+        cmd, retcode, _ = await _read_frame(reader, parser)
+        assert (cmd, retcode) == (CONTROL, 1)
+    proxy.api.async_send_dps.assert_not_awaited()
+
+    writer.close()
@@ -0,0 +1,71 @@
+"""Test the cleaning scene catalogue."""
+
+import time
+
+from custom_components.eufy_clean.const import SCENE_TTL
+from custom_components.eufy_clean.scenes import (
+    Scene,
+    SceneCatalogue,
+    parse_scenes,
+    scene_etag,
+)
+
+
+def test_parse_scenes():
+    """Test scene entries are normalized and invalid ones skipped."""
+    scenes = parse_scenes(
+        [
+            {"id": 3, "name": " Kitchen "},
+            {"sceneId": "7", "sceneName": "Bedroom"},
+            {"id": 3, "name": "Duplicate"},
+            {"id": "auto", "name": "No numeric id"},
+            {"name": "No id"},
+            {"id": 9},
+        ]
+    )
+
+    assert scenes == (
+        Scene(3, "Kitchen"),
+        Scene(7, "Bedroom"),
+        Scene(9, "Scene 9"),
+    )
+
+
+def test_parse_wrapped_scenes():
+    """Test a list wrapped in an object is read and non-objects skipped."""
+    assert parse_scenes({"list": [{"id": 1, "name": "Hall"}, "junk", 7]}) == (
+        Scene(1, "Hall"),
+    )
+    assert parse_scenes({"total": 0}) == ()
+    assert parse_scenes(None) == ()
+
+
+def test_etag_follows_content():
+    """Test the tag changes with names, ids and order only."""
+    scenes = (Scene(1, "Kitchen"), Scene(2, "Bedroom"))
+
+    assert scene_etag(scenes) == scene_etag(list(scenes))
+    assert scene_etag(scenes) != scene_etag(scenes[::-1])
+    assert scene_etag(scenes) != scene_etag((Scene(1, "Kitchen"), Scene(2, "Hall")))
+
+
+async def test_catalogue_round_trip(hass, hass_storage):
+    """Test fetched scenes are saved with their tag and loaded back."""
+    catalogue = SceneCatalogue(hass, "test_device_id")
+    assert catalogue.expired
+
+    assert await catalogue.async_update([Scene(1, "Kitchen"), Scene(2, "Kitchen")])
+    assert not await catalogue.async_update([Scene(1, "Kitchen"), Scene(2, "Kitchen")])
+    assert not catalogue.expired
+
+    restored = SceneCatalogue(hass, "test_device_id")
+    await restored.async_load()
+    assert restored.scenes == catalogue.scenes
+    assert restored.etag == catalogue.etag
+    assert list(restored.labels) == ["Kitchen (1)", "Kitchen (2)"]
+    assert restored.find("Kitchen (2)") == Scene(2, "Kitchen")
+    assert restored.find("2") == Scene(2, "Kitchen")
+    assert restored.find("Hall") is None
+
+    restored.fetched_at = time.time() - SCENE_TTL - 1
+    assert restored.expired
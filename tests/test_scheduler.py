@@ -0,0 +1,116 @@
+"""Test the per-device request scheduler."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.eufy_clean.scheduler import (
+    DeviceRequestScheduler,
+    RequestDroppedError,
+)
+
+
+class FakeDevice:
+    """Blocking calls that finish when the test releases them."""
+
+    def __init__(self) -> None:
+        """Initialize the fake."""
+        self.calls: list[str] = []
+        self.release: dict[str, asyncio.Event] = {}
+
+    async def run(self, func, *args, sheddable=False):
+        """Run a call, waiting for the test to release it."""
+        name = func(*args)
+        self.calls.append(name)
+        event = self.release.setdefault(name, asyncio.Event())
+        await event.wait()
+        return name
+
+    def finish(self, name: str) -> None:
+        """Let a call complete."""
+        self.release.setdefault(name, asyncio.Event()).set()
+
+
+def _call(name: str):
+    """Return a callable producing ``name``."""
+    return lambda: name
+
+
+async def test_commands_run_before_queued_polls():
+    """Test commands jump ahead of polls and queued polls are dropped."""
+    device = FakeDevice()
+    interrupt = MagicMock()
+    scheduler = DeviceRequestScheduler(device.run, interrupt)
+
+    first = asyncio.ensure_future(scheduler.async_command(_call("connect")))
+    await asyncio.sleep(0)
+    poll = asyncio.ensure_future(scheduler.async_poll(_call("poll")))
+    await asyncio.sleep(0)
+    command = asyncio.ensure_future(scheduler.async_command(_call("start")))
+    await asyncio.sleep(0)
+
+    with pytest.raises(RequestDroppedError):
+        await poll
+
+    device.finish("connect")
+    device.finish("start")
+    assert await first == "connect"
+    assert await command == "start"
+    assert device.calls == ["connect", "start"]
+    interrupt.assert_not_called()
+
+
+async def test_poll_dropped_while_command_pending():
+    """Test a poll submitted while a command is in flight is not queued."""
+    device = FakeDevice()
+    scheduler = DeviceRequestScheduler(device.run, MagicMock())
+
+    command = asyncio.ensure_future(scheduler.async_command(_call("start")))
+    await asyncio.sleep(0)
+
+    with pytest.raises(RequestDroppedError):
+        await scheduler.async_poll(_call("poll"))
+
+    device.finish("start")
+    await command
+    assert device.calls == ["start"]
+
+
+async def test_in_flight_poll_interrupted_by_command():
+    """Test a slow poll is interrupted and its caller released at once."""
+    device = FakeDevice()
+    interrupt = MagicMock(side_effect=lambda: device.finish("poll"))
+    scheduler = DeviceRequestScheduler(device.run, interrupt)
+
+    poll = asyncio.ensure_future(scheduler.async_poll(_call("poll")))
+    await asyncio.sleep(0)
+    command = asyncio.ensure_future(scheduler.async_command(_call("stop")))
+    await asyncio.sleep(0)
+
+    interrupt.assert_called_once()
+    with pytest.raises(RequestDroppedError):
+        await poll
+
+    device.finish("stop")
+    assert await command == "stop"
+    assert device.calls == ["poll", "stop"]
+
+
+async def test_cancelled_request_removed_from_queue():
+    """Test a caller giving up removes its request from the queue."""
+    device = FakeDevice()
+    scheduler = DeviceRequestScheduler(device.run, MagicMock())
+
+    first = asyncio.ensure_future(scheduler.async_command(_call("first")))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(scheduler.async_command(_call("second")))
+    await asyncio.sleep(0)
+    second.cancel()
+    await asyncio.sleep(0)
+
+    device.finish("first")
+    await first
+    await asyncio.sleep(0)
+    assert device.calls == ["first"]
+    assert not scheduler.command_pending
@@ -0,0 +1,113 @@
+"""Test the Eufy Clean scene select."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.components.select import (
+    ATTR_OPTION,
+    ATTR_OPTIONS,
+    SERVICE_SELECT_OPTION,
+)
+from homeassistant.components.select import DOMAIN as SELECT_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.exceptions import HomeAssistantError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.eufy_clean.const import DOMAIN, STORAGE_KEY_SCENES
+from custom_components.eufy_clean.device_profile import DEFAULT_PROFILE, SCENE_PROFILE
+from custom_components.eufy_clean.health import HealthTracker
+
+ENTITY_ID = "select.test_vacuum_cleaning_scene"
+
+
+async def _setup_vacuum(hass, mock_config_entry_data, mock_api, profile=SCENE_PROFILE):
+    """Set up one vacuum backed by the mocked API."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Vacuum",
+        data=mock_config_entry_data,
+        unique_id="test_device_id",
+    )
+    entry.add_to_hass(hass)
+
+    api_instance = mock_api.return_value
+    api_instance.device_id = "test_device_id"
+    api_instance.health = HealthTracker()
+    api_instance.profile = profile
+    api_instance.async_connect = AsyncMock()
+    api_instance.async_disconnect = AsyncMock()
+    api_instance.async_get_status = AsyncMock(
+        return_value={
+            "state": "idle",
+            "battery": 100,
+            "fan_speed": "Standard",
+            "error_code": "0",
+            "is_on": False,
+        }
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return api_instance
+
+
+def _store_scenes(hass_storage, scenes):
+    """Save a scene catalogue as fetched during setup."""
+    hass_storage[f"{STORAGE_KEY_SCENES}.test_device_id"] = {
+        "version": 1,
+        "key": f"{STORAGE_KEY_SCENES}.test_device_id",
+        "data": {"scenes": scenes, "etag": "tag", "fetched_at": 0},
+    }
+
+
+async def test_no_select_without_scenes(hass, mock_config_entry_data):
+    """Test vacuums without cached scenes get no select."""
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        await _setup_vacuum(hass, mock_config_entry_data, mock_api)
+
+    assert hass.states.get(ENTITY_ID) is None
+
+
+async def test_no_select_without_scene_dps(hass, hass_storage, mock_config_entry_data):
+    """Test models taking no scene commands get no select."""
+    _store_scenes(hass_storage, [[1, "Kitchen"]])
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        await _setup_vacuum(hass, mock_config_entry_data, mock_api, DEFAULT_PROFILE)
+
+    assert hass.states.get(ENTITY_ID) is None
+
+
+async def test_select_starts_scene(hass, hass_storage, mock_config_entry_data):
+    """Test selecting a scene writes its id to the vacuum."""
+    _store_scenes(hass_storage, [[1, "Kitchen"], [2, "Bedroom"], [3, "Kitchen"]])
+
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = await _setup_vacuum(hass, mock_config_entry_data, mock_api)
+        api_instance.async_clean_scene = AsyncMock(return_value=True)
+
+        state = hass.states.get(ENTITY_ID)
+        assert state.attributes[ATTR_OPTIONS] == [
+            "Kitchen (1)",
+            "Bedroom",
+            "Kitchen (3)",
+        ]
+
+        await hass.services.async_call(
+            SELECT_DOMAIN,
+            SERVICE_SELECT_OPTION,
+            {ATTR_ENTITY_ID: ENTITY_ID, ATTR_OPTION: "Kitchen (3)"},
+            blocking=True,
+        )
+
+        api_instance.async_clean_scene.assert_awaited_once_with(3)
+        assert hass.states.get(ENTITY_ID).state == "Kitchen (3)"
+
+        api_instance.async_clean_scene = AsyncMock(return_value=False)
+        with pytest.raises(HomeAssistantError):
+            await hass.services.async_call(
+                SELECT_DOMAIN,
+                SERVICE_SELECT_OPTION,
+                {ATTR_ENTITY_ID: ENTITY_ID, ATTR_OPTION: "Bedroom"},
+                blocking=True,
+            )
+        assert hass.states.get(ENTITY_ID).state == "Kitchen (3)"
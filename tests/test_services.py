@@ -0,0 +1,246 @@
+"""Test the Eufy Clean services."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.eufy_clean.const import (
+    ATTR_COMMAND,
+    ATTR_DPS,
+    ATTR_INCLUDE_DPS,
+    ATTR_RETRIES,
+    ATTR_SCENE,
+    ATTR_STAGGER,
+    DOMAIN,
+    SERVICE_FLEET_COMMAND,
+    SERVICE_GET_HISTORY,
+    SERVICE_SCENE_CLEAN,
+    SERVICE_SEND_DPS,
+    STORAGE_KEY_SCENES,
+)
+from custom_components.eufy_clean.device_profile import DEFAULT_PROFILE, DeviceProfile
+from custom_components.eufy_clean.health import HealthTracker
+
+
+async def _setup_vacuum(
+    hass, mock_config_entry_data, mock_api, profile=DEFAULT_PROFILE
+):
+    """Set up one vacuum backed by the mocked API."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Vacuum",
+        data=mock_config_entry_data,
+        unique_id="test_device_id",
+    )
+    entry.add_to_hass(hass)
+
+    api_instance = mock_api.return_value
+    api_instance.device_id = "test_device_id"
+    api_instance.health = HealthTracker()
+    api_instance.profile = profile
+    api_instance.async_connect = AsyncMock()
+    api_instance.async_disconnect = AsyncMock()
+    api_instance.async_get_status = AsyncMock(
+        return_value={
+            "state": "idle",
+            "battery": 100,
+            "fan_speed": "Standard",
+            "error_code": "0",
+            "is_on": False,
+        }
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return api_instance
+
+
+async def test_send_dps_returns_per_device_results(hass, mock_config_entry_data):
+    """Test raw DPS writes report success and latency per vacuum."""
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = await _setup_vacuum(hass, mock_config_entry_data, mock_api)
+        api_instance.async_send_dps = AsyncMock(return_value=True)
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEND_DPS,
+            {ATTR_ENTITY_ID: ["vacuum.test_vacuum"], ATTR_DPS: {"101": True}},
+            blocking=True,
+            return_response=True,
+        )
+
+        api_instance.async_send_dps.assert_called_once_with({"101": True})
+        result = response["vacuum.test_vacuum"]
+        assert result["success"] is True
+        assert result["latency_ms"] >= 0
+
+
+async def test_send_dps_reports_invalid_writes(hass, mock_config_entry_data):
+    """Test a write rejected by the profile is reported, not raised."""
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = await _setup_vacuum(hass, mock_config_entry_data, mock_api)
+        api_instance.async_send_dps = AsyncMock(
+            side_effect=ValueError("DPS 104 is not writable on default devices")
+        )
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEND_DPS,
+            {ATTR_ENTITY_ID: ["vacuum.test_vacuum"], ATTR_DPS: {"104": 1}},
+            blocking=True,
+            return_response=True,
+        )
+
+        result = response["vacuum.test_vacuum"]
+        assert result["success"] is False
+        assert "not writable" in result["error"]
+
+
+async def test_send_dps_unknown_entity(hass, mock_config_entry_data):
+    """Test targeting an entity of another integration fails validation."""
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        await _setup_vacuum(hass, mock_config_entry_data, mock_api)
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_SEND_DPS,
+                {ATTR_ENTITY_ID: ["vacuum.other"], ATTR_DPS: {"101": True}},
+                blocking=True,
+                return_response=True,
+            )
+
+
+async def test_fleet_command_reports_aggregate(hass, mock_config_entry_data):
+    """Test the fleet command retries and summarizes the dispatch."""
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = await _setup_vacuum(hass, mock_config_entry_data, mock_api)
+        api_instance.async_start = AsyncMock(side_effect=[False, True])
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FLEET_COMMAND,
+            {
+                ATTR_ENTITY_ID: ["vacuum.test_vacuum"],
+                ATTR_COMMAND: "start",
+                ATTR_STAGGER: 0,
+                ATTR_RETRIES: 1,
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+        assert api_instance.async_start.call_count == 2
+        assert response["succeeded"] == 1
+        assert response["failed"] == 0
+        assert response["devices"]["vacuum.test_vacuum"]["attempts"] == 2
+
+
+async def test_fleet_command_rejects_unused_dps(hass, mock_config_entry_data):
+    """Test DPS values are refused for commands that do not write them."""
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = await _setup_vacuum(hass, mock_config_entry_data, mock_api)
+        api_instance.async_start = AsyncMock(return_value=True)
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_FLEET_COMMAND,
+                {
+                    ATTR_ENTITY_ID: ["vacuum.test_vacuum"],
+                    ATTR_COMMAND: "start",
+                    ATTR_DPS: {"101": True},
+                },
+                blocking=True,
+                return_response=True,
+            )
+
+        api_instance.async_start.assert_not_called()
+
+
+async def test_get_history_returns_runs(hass, mock_config_entry_data):
+    """Test a cleaning run and its DPS changes are logged and returned."""
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = await _setup_vacuum(hass, mock_config_entry_data, mock_api)
+        coordinator = next(iter(hass.data[DOMAIN].values()))
+        dps_listener = api_instance.async_add_dps_listener.call_args[0][0]
+        idle = api_instance.async_get_status.return_value
+
+        api_instance.async_get_status.return_value = {
+            **idle,
+            "state": "cleaning",
+            "battery": 90,
+            "error_code": "2",
+        }
+        await coordinator.async_refresh()
+        dps_listener({"15": "running"})
+        api_instance.async_get_status.return_value = {**idle, "battery": 70}
+        await coordinator.async_refresh()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_HISTORY,
+            {ATTR_ENTITY_ID: ["vacuum.test_vacuum"], ATTR_INCLUDE_DPS: True},
+            blocking=True,
+            return_response=True,
+        )
+
+    history = response["vacuum.test_vacuum"]
+    (session,) = history["sessions"]
+    assert session["battery_used"] == 20
+    assert session["errors"] == ["2"]
+    assert [change["dps"] for change in history["dps"]] == [{"15": "running"}]
+
+
+async def test_scene_clean_by_name_or_id(hass, hass_storage, mock_config_entry_data):
+    """Test scenes are started by name or id with one local write."""
+    hass_storage[f"{STORAGE_KEY_SCENES}.test_device_id"] = {
+        "version": 1,
+        "key": f"{STORAGE_KEY_SCENES}.test_device_id",
+        "data": {
+            "scenes": [[4, "Kitchen"], [5, "Bedroom"]],
+            "etag": "tag",
+            "fetched_at": 0,
+        },
+    }
+    profile = DeviceProfile(name="scenes", dps=DEFAULT_PROFILE.dps, scene_dps="5")
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = await _setup_vacuum(
+            hass, mock_config_entry_data, mock_api, profile
+        )
+        api_instance.async_clean_scene = AsyncMock(return_value=True)
+
+        for scene, scene_id in (("Bedroom", 5), ("4", 4)):
+            response = await hass.services.async_call(
+                DOMAIN,
+                SERVICE_SCENE_CLEAN,
+                {ATTR_ENTITY_ID: ["vacuum.test_vacuum"], ATTR_SCENE: scene},
+                blocking=True,
+                return_response=True,
+            )
+            api_instance.async_clean_scene.assert_awaited_with(scene_id)
+            assert response["vacuum.test_vacuum"]["success"] is True
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_SCENE_CLEAN,
+                {ATTR_ENTITY_ID: ["vacuum.test_vacuum"], ATTR_SCENE: "Hall"},
+                blocking=True,
+                return_response=True,
+            )
+        assert api_instance.async_clean_scene.await_count == 2
+
+        api_instance.profile = DEFAULT_PROFILE
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_SCENE_CLEAN,
+                {ATTR_ENTITY_ID: ["vacuum.test_vacuum"], ATTR_SCENE: "Kitchen"},
+                blocking=True,
+                return_response=True,
+            )
+        assert api_instance.async_clean_scene.await_count == 2
@@ -0,0 +1,145 @@
+"""Test the incremental Tuya frame parser."""
+
+import random
+from pathlib import Path
+
+from custom_components.eufy_clean.tuya_frame import (
+    TuyaFrameParser,
+    pack_frame,
+)
+
+CORPUS = Path(__file__).parent / "fixtures" / "tuya_frame_corpus.txt"
+
+
+def _load_corpus() -> list[bytes]:
+    """Load the seed frames from the fuzz corpus."""
+    return [
+        bytes.fromhex(line)
+        for line in CORPUS.read_text().splitlines()
+        if line and not line.startswith("#")
+    ]
+
+
+def _parse(parser: TuyaFrameParser) -> list[tuple[int, int, int | None, bytes]]:
+    """Drain the parser into plain tuples."""
+    return [
+        (frame.seqno, frame.cmd, frame.retcode, bytes(frame.payload))
+        for frame in parser
+    ]
+
+
+def test_single_frame():
+    """Test parsing a single frame with a return code."""
+    parser = TuyaFrameParser()
+    parser.feed(pack_frame(1, 10, b'{"dps":{}}', retcode=0))
+
+    assert _parse(parser) == [(1, 10, 0, b'{"dps":{}}')]
+    assert parser.buffered == 0
+
+
+def test_partial_and_coalesced_reads():
+    """Test frames split across reads and several frames in one read."""
+    frames = [pack_frame(seq, 8, bytes(seq * 7)) for seq in range(1, 30)]
+    stream = b"".join(frames)
+    parser = TuyaFrameParser(buffer_size=64)
+    parsed = []
+
+    rng = random.Random(1)
+    pos = 0
+    while pos < len(stream):
+        size = rng.randint(1, 300)
+        parser.feed(stream[pos : pos + size])
+        pos += size
+        parsed.extend(_parse(parser))
+
+    assert [frame[0] for frame in parsed] == list(range(1, 30))
+    assert parser.frames_dropped == 0
+
+
+def test_buffered_protocol_interface():
+    """Test writing straight into the parser buffer."""
+    frame = pack_frame(3, 8, b"payload")
+    parser = TuyaFrameParser()
+
+    view = parser.get_buffer(len(frame))
+    view[: len(frame)] = frame
+    parser.buffer_updated(len(frame))
+
+    assert _parse(parser) == [(3, 8, None, b"payload")]
+
+
+def test_corrupt_frame_dropped():
+    """Test a frame with a bad checksum is dropped and parsing resumes."""
+    bad = bytearray(pack_frame(2, 8, b"corrupted"))
+    bad[20] ^= 0xFF
+    parser = TuyaFrameParser()
+    parser.feed(pack_frame(1, 8, b"a") + bytes(bad) + pack_frame(3, 8, b"c"))
+
+    assert [frame[0] for frame in _parse(parser)] == [1, 3]
+    assert parser.frames_dropped == 1
+
+
+def test_leading_garbage_skipped():
+    """Test bytes before the first prefix are discarded."""
+    parser = TuyaFrameParser()
+    parser.feed(b"\x00\x00\x55noise" + pack_frame(1, 9, b""))
+
+    assert [frame[0] for frame in _parse(parser)] == [1]
+    assert parser.bytes_discarded == 8
+
+
+def test_oversized_length_rejected():
+    """Test a length field above the limit is not buffered."""
+    frame = bytearray(pack_frame(1, 8, b"x" * 100))
+    parser = TuyaFrameParser(max_frame_size=64)
+    parser.feed(bytes(frame))
+
+    assert _parse(parser) == []
+    assert parser.frames_dropped == 1
+
+
+def test_hmac_trailer():
+    """Test 3.4 frames are verified with HMAC-SHA256."""
+    key = b"0123456789abcdef"
+    parser = TuyaFrameParser(hmac_key=key)
+    parser.feed(
+        pack_frame(1, 8, b"good", retcode=0, hmac_key=key)
+        + pack_frame(2, 8, b"forged", retcode=0, hmac_key=b"wrong-key-000000")
+    )
+
+    assert _parse(parser) == [(1, 8, 0, b"good")]
+    assert parser.frames_dropped == 1
+
+
+def test_fuzz_corpus():
+    """Test random mutations of the corpus never yield a corrupt frame."""
+    corpus = _load_corpus()
+    valid = {bytes(frame) for frame in corpus}
+    rng = random.Random(26)
+
+    for _ in range(500):
+        data = bytearray(rng.choice(corpus))
+        for _ in range(rng.randint(1, 4)):
+            if not data:
+                break
+            mutation = rng.randrange(4)
+            pos = rng.randrange(len(data))
+            if mutation == 0:
+                data[pos] ^= 1 << rng.randrange(8)
+            elif mutation == 1:
+                del data[pos:]
+            elif mutation == 2:
+                data[pos:pos] = rng.choice(corpus)
+            else:
+                data[pos : pos + 4] = rng.randbytes(4)
+
+        parser = TuyaFrameParser()
+        pos = 0
+        while pos < len(data):
+            size = rng.randint(1, 512)
+            parser.feed(data[pos : pos + size])
+            pos += size
+            for seqno, cmd, retcode, payload in _parse(parser):
+                repacked = pack_frame(seqno, cmd, payload, retcode=retcode)
+                assert repacked in bytes(data)
+                assert any(repacked in frame for frame in valid)
@@ -1,20 +1,29 @@
 """Test the Eufy Clean vacuum platform."""
 
+from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
+import pytest
 from homeassistant.components.vacuum import (
+    ATTR_COMMAND,
     ATTR_FAN_SPEED,
+    ATTR_PARAMS,
     SERVICE_PAUSE,
     SERVICE_RETURN_TO_BASE,
+    SERVICE_SEND_COMMAND,
     SERVICE_SET_FAN_SPEED,
     SERVICE_START,
     SERVICE_STOP,
 )
 from homeassistant.components.vacuum import DOMAIN as VACUUM_DOMAIN
 from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.eufy_clean.const import DOMAIN
+from custom_components.eufy_clean.device_profile import DEFAULT_PROFILE
+from custom_components.eufy_clean.health import HealthTracker
 
 
 async def test_vacuum_setup(hass, mock_config_entry_data):
@@ -29,6 +38,8 @@ async def test_vacuum_setup(hass, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_get_status = AsyncMock(
@@ -42,7 +53,7 @@ async def test_vacuum_setup(hass, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         entity_id = "vacuum.test_vacuum"
         state = hass.states.get(entity_id)
@@ -64,6 +75,8 @@ async def test_vacuum_start(hass, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_start = AsyncMock(return_value=True)
@@ -78,7 +91,7 @@ async def test_vacuum_start(hass, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         entity_id = "vacuum.test_vacuum"
 
@@ -88,7 +101,7 @@ async def test_vacuum_start(hass, mock_config_entry_data):
             {ATTR_ENTITY_ID: entity_id},
             blocking=True,
         )
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         api_instance.async_start.assert_called_once()
 
@@ -105,6 +118,8 @@ async def test_vacuum_stop(hass, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_stop = AsyncMock(return_value=True)
@@ -119,7 +134,7 @@ async def test_vacuum_stop(hass, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         entity_id = "vacuum.test_vacuum"
 
@@ -129,7 +144,7 @@ async def test_vacuum_stop(hass, mock_config_entry_data):
             {ATTR_ENTITY_ID: entity_id},
             blocking=True,
         )
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         api_instance.async_stop.assert_called_once()
 
@@ -146,6 +161,8 @@ async def test_vacuum_pause(hass, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_pause = AsyncMock(return_value=True)
@@ -160,7 +177,7 @@ async def test_vacuum_pause(hass, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         entity_id = "vacuum.test_vacuum"
 
@@ -170,7 +187,7 @@ async def test_vacuum_pause(hass, mock_config_entry_data):
             {ATTR_ENTITY_ID: entity_id},
             blocking=True,
         )
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         api_instance.async_pause.assert_called_once()
 
@@ -187,6 +204,8 @@ async def test_vacuum_return_to_base(hass, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_return_to_base = AsyncMock(return_value=True)
@@ -201,7 +220,7 @@ async def test_vacuum_return_to_base(hass, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         entity_id = "vacuum.test_vacuum"
 
@@ -211,7 +230,7 @@ async def test_vacuum_return_to_base(hass, mock_config_entry_data):
             {ATTR_ENTITY_ID: entity_id},
             blocking=True,
         )
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         api_instance.async_return_to_base.assert_called_once()
 
@@ -228,6 +247,8 @@ async def test_vacuum_set_fan_speed(hass, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_set_fan_speed = AsyncMock(return_value=True)
@@ -242,7 +263,7 @@ async def test_vacuum_set_fan_speed(hass, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         entity_id = "vacuum.test_vacuum"
 
@@ -252,7 +273,7 @@ async def test_vacuum_set_fan_speed(hass, mock_config_entry_data):
             {ATTR_ENTITY_ID: entity_id, ATTR_FAN_SPEED: "Turbo"},
             blocking=True,
         )
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         api_instance.async_set_fan_speed.assert_called_once_with("Turbo")
 
@@ -269,6 +290,8 @@ async def test_vacuum_error_state(hass, mock_config_entry_data):
 
     with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
         api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
         api_instance.async_connect = AsyncMock()
         api_instance.async_disconnect = AsyncMock()
         api_instance.async_get_status = AsyncMock(
@@ -282,7 +305,7 @@ async def test_vacuum_error_state(hass, mock_config_entry_data):
         )
 
         assert await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await hass.async_block_till_done(wait_background_tasks=True)
 
         entity_id = "vacuum.test_vacuum"
         state = hass.states.get(entity_id)
@@ -291,3 +314,151 @@ async def test_vacuum_error_state(hass, mock_config_entry_data):
         assert state.state == "error"
         assert "error" in state.attributes
         assert "Wheel stuck" in state.attributes["error"]
+
+
+async def test_vacuum_restored_state(hass, hass_storage, mock_config_entry_data):
+    """Test the last known state is restored while the device is unreachable."""
+    hass_storage["eufy_clean.status.test_device_id"] = {
+        "version": 1,
+        "key": "eufy_clean.status.test_device_id",
+        "data": {
+            "status": {
+                "state": "docked",
+                "battery": 80,
+                "fan_speed": "Max",
+                "error_code": "0",
+                "is_on": False,
+            },
+            "updated_at": "2026-01-01T10:00:00+00:00",
+        },
+    }
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Vacuum",
+        data=mock_config_entry_data,
+        unique_id="test_device_id",
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
+        api_instance.device_id = "test_device_id"
+        api_instance.async_connect = AsyncMock()
+        api_instance.async_disconnect = AsyncMock()
+        api_instance.async_get_status = AsyncMock(return_value=None)
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        state = hass.states.get("vacuum.test_vacuum")
+
+        assert state is not None
+        assert state.state == "docked"
+        assert state.attributes[ATTR_FAN_SPEED] == "Max"
+        assert state.attributes["stale"] is True
+        assert state.attributes["last_seen"] == "2026-01-01T10:00:00+00:00"
+
+
+async def test_vacuum_status_saved_without_raw_dps(
+    hass, hass_storage, mock_config_entry_data
+):
+    """Test every poll updates last_seen and the raw DPS are not saved."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Vacuum",
+        data=mock_config_entry_data,
+        unique_id="test_device_id",
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
+        api_instance.device_id = "test_device_id"
+        api_instance.async_connect = AsyncMock()
+        api_instance.async_disconnect = AsyncMock()
+        api_instance.async_get_status = AsyncMock(
+            return_value={
+                "state": "docked",
+                "battery": 80,
+                "fan_speed": "Max",
+                "error_code": "0",
+                "is_on": False,
+                "raw_dps": {"15": "standby", "104": 80},
+            }
+        )
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        first_seen = coordinator.last_seen
+        with patch(
+            "custom_components.eufy_clean.coordinator.dt_util.utcnow",
+            return_value=dt_util.utcnow() + timedelta(minutes=1),
+        ):
+            await coordinator.async_refresh()
+
+        assert coordinator.last_seen > first_seen
+        stored = coordinator._data_to_store()
+        assert "raw_dps" not in stored["status"]
+        assert stored["status"]["battery"] == 80
+        assert coordinator.data["raw_dps"] == {"15": "standby", "104": 80}
+
+
+async def test_vacuum_send_command(hass, mock_config_entry_data):
+    """Test raw DPS writes through vacuum.send_command."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Vacuum",
+        data=mock_config_entry_data,
+        unique_id="test_device_id",
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.eufy_clean.EufyCleanAPI") as mock_api:
+        api_instance = mock_api.return_value
+        api_instance.health = HealthTracker()
+        api_instance.profile = DEFAULT_PROFILE
+        api_instance.async_connect = AsyncMock()
+        api_instance.async_disconnect = AsyncMock()
+        api_instance.async_send_dps = AsyncMock(return_value=True)
+        api_instance.async_get_status = AsyncMock(
+            return_value={
+                "state": "idle",
+                "battery": 100,
+                "fan_speed": "Standard",
+                "error_code": "0",
+                "is_on": False,
+            }
+        )
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        entity_id = "vacuum.test_vacuum"
+
+        await hass.services.async_call(
+            VACUUM_DOMAIN,
+            SERVICE_SEND_COMMAND,
+            {
+                ATTR_ENTITY_ID: entity_id,
+                ATTR_COMMAND: "set_dps",
+                ATTR_PARAMS: {"101": True},
+            },
+            blocking=True,
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        api_instance.async_send_dps.assert_called_once_with({"101": True})
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                VACUUM_DOMAIN,
+                SERVICE_SEND_COMMAND,
+                {ATTR_ENTITY_ID: entity_id, ATTR_COMMAND: "locate"},
+                blocking=True,
+            )